@@ -25,13 +25,16 @@ Example:
 """
 
 import os
+import re
 import sys
 import asyncio
 import logging
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from typing import Optional, Literal
 from pathlib import Path
-from pydantic import BaseModel
 
 # Import ADW modules using proper package paths
 from adws.adw_modules.agent import (
@@ -44,8 +47,17 @@ from adws.adw_modules.agent import (
 # Configure logger
 logger = logging.getLogger(__name__)
 
+# Runs blocking execute_template calls off the event loop. Created once so
+# each workflow reuses warm threads instead of going through the loop's
+# lazily created default executor.
+_TEMPLATE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="adw-template")
 
-class WorkflowResult(BaseModel):
+# Plan file path printed by the /chore command, compiled once at import
+_PLAN_PATH_PATTERN = re.compile(r"specs/chore-[a-zA-Z0-9\-]+\.md")
+
+
+@dataclass(frozen=True, slots=True, kw_only=True)
+class WorkflowResult:
     """Result from an ADW workflow execution.
 
     Attributes:
@@ -56,7 +68,12 @@ class WorkflowResult(BaseModel):
         output_dir: Directory containing workflow artifacts
         plan_path: Path to generated plan file (for chore workflows)
         error_message: Error message if workflow failed
+
+    Results are immutable; use dataclasses.replace() to derive a changed one.
+    A plain dataclass rather than a pydantic model, since every field is set
+    by this module and needs no validation.
     """
+
     success: bool
     output: str
     session_id: Optional[str] = None
@@ -65,6 +82,30 @@ class WorkflowResult(BaseModel):
     plan_path: Optional[str] = None
     error_message: Optional[str] = None
 
+    @classmethod
+    def ok(
+        cls,
+        output: str,
+        session_id: Optional[str],
+        adw_id: str,
+        *,
+        output_dir: str = "",
+        plan_path: Optional[str] = None,
+    ) -> "WorkflowResult":
+        """Build a successful result.
+
+        Example:
+            result = WorkflowResult.ok("Chore completed", "chore-session", "abc12345")
+        """
+        return cls(
+            success=True,
+            output=output,
+            session_id=session_id,
+            adw_id=adw_id,
+            output_dir=output_dir,
+            plan_path=plan_path,
+        )
+
 
 async def trigger_chore_workflow(
     prompt: str,
@@ -123,9 +164,8 @@ async def trigger_chore_workflow(
     try:
         # Execute in thread pool to avoid blocking async event loop
         logger.info(f"   Executing template in thread pool...")
-        loop = asyncio.get_event_loop()
-        response: AgentPromptResponse = await loop.run_in_executor(
-            None,
+        response: AgentPromptResponse = await asyncio.get_running_loop().run_in_executor(
+            _TEMPLATE_EXECUTOR,
             execute_template,
             request
         )
@@ -138,8 +178,7 @@ async def trigger_chore_workflow(
         plan_path = None
         if response.success:
             # Look for specs/chore-*.md pattern in output
-            import re
-            match = re.search(r"specs/chore-[a-zA-Z0-9\-]+\.md", response.output)
+            match = _PLAN_PATH_PATTERN.search(response.output)
             if match:
                 plan_path = match.group(0)
                 logger.info(f"Plan created at: {plan_path}")
@@ -220,9 +259,8 @@ async def trigger_implement_workflow(
     try:
         # Execute in thread pool to avoid blocking async event loop
         logger.info(f"   Executing template in thread pool...")
-        loop = asyncio.get_event_loop()
-        response: AgentPromptResponse = await loop.run_in_executor(
-            None,
+        response: AgentPromptResponse = await asyncio.get_running_loop().run_in_executor(
+            _TEMPLATE_EXECUTOR,
             execute_template,
             request
         )
@@ -398,6 +436,78 @@ def generate_pr_body(
     return ''.join(pr_body_parts)
 
 
+def _publish_changes(
+    issue_number: int,
+    issue_title: Optional[str],
+    prompt: str,
+    adw_id: str,
+    plan_path: Optional[str],
+    model: str,
+    branch_name: str,
+    working_dir: str,
+    repo_owner: str,
+    repo_name: str,
+) -> Optional[str]:
+    """Commit the implementation, push the branch and open a pull request.
+
+    Every step shells out to git or gh, so callers on the event loop run
+    this through asyncio.to_thread.
+
+    Returns:
+        URL of the created pull request, or None if any step failed
+    """
+    from adws.adw_modules.git_ops import commit_changes, push_branch, create_pull_request
+
+    logger.info("Starting git operations...")
+    pr_url = None
+
+    # Commit changes
+    commit_message = f"Implement issue #{issue_number}: {issue_title}\n\nADW ID: {adw_id}"
+    logger.info(f"Committing changes: {commit_message[:100]}...")
+    if commit_changes(commit_message, working_dir, logger):
+        logger.info("✓ Changes committed")
+
+        # Push branch
+        logger.info(f"Pushing branch {branch_name}...")
+        if push_branch(branch_name, working_dir, logger):
+            logger.info("✓ Branch pushed")
+
+            # Create PR
+            pr_title = f"{issue_title} (#{issue_number})"
+            pr_body = generate_pr_body(
+                issue_number=issue_number,
+                prompt=prompt,
+                adw_id=adw_id,
+                plan_path=plan_path,
+                model=model,
+                working_dir=working_dir,
+                logger=logger,
+            )
+
+            logger.info(f"Creating pull request...")
+            pr_url = create_pull_request(
+                title=pr_title,
+                body=pr_body,
+                branch_name=branch_name,
+                issue_number=issue_number,
+                working_dir=working_dir,
+                repo_owner=repo_owner,
+                repo_name=repo_name,
+                logger=logger,
+            )
+
+            if pr_url:
+                logger.info(f"✓ Pull request created: {pr_url}")
+            else:
+                logger.warning("⚠️ Failed to create pull request")
+        else:
+            logger.warning("⚠️ Failed to push branch")
+    else:
+        logger.warning("⚠️ Failed to commit changes (may be no changes to commit)")
+
+    return pr_url
+
+
 async def trigger_chore_implement_workflow(
     prompt: str,
     adw_id: Optional[str] = None,
@@ -472,7 +582,7 @@ async def trigger_chore_implement_workflow(
             branch_name = f"issue-{issue_number}"
 
         logger.info(f"Creating branch: {branch_name}")
-        if create_branch(branch_name, working_dir, logger=logger):
+        if await asyncio.to_thread(create_branch, branch_name, working_dir, logger=logger):
             logger.info(f"✓ Branch created: {branch_name}")
         else:
             logger.warning(f"⚠️ Failed to create branch {branch_name}, continuing anyway")
@@ -494,8 +604,11 @@ async def trigger_chore_implement_workflow(
     # Check if we got a plan path
     if not chore_result.plan_path:
         logger.error(f"Chore workflow succeeded but no plan path found for adw_id={adw_id}")
-        chore_result.success = False
-        chore_result.error_message = "Plan file path not found in chore output"
+        chore_result = replace(
+            chore_result,
+            success=False,
+            error_message="Plan file path not found in chore output",
+        )
         return chore_result, None
 
     # Phase 2: Run implement workflow
@@ -509,53 +622,19 @@ async def trigger_chore_implement_workflow(
     # Phase 3: Commit, push, and create PR if git info provided
     pr_url = None
     if implement_result.success and branch_name and repo_owner and repo_name:
-        from adws.adw_modules.git_ops import commit_changes, push_branch, create_pull_request
-
-        logger.info("Starting git operations...")
-
-        # Commit changes
-        commit_message = f"Implement issue #{issue_number}: {issue_title}\n\nADW ID: {adw_id}"
-        logger.info(f"Committing changes: {commit_message[:100]}...")
-        if commit_changes(commit_message, working_dir, logger):
-            logger.info("✓ Changes committed")
-
-            # Push branch
-            logger.info(f"Pushing branch {branch_name}...")
-            if push_branch(branch_name, working_dir, logger):
-                logger.info("✓ Branch pushed")
-
-                # Create PR
-                pr_title = f"{issue_title} (#{issue_number})"
-                pr_body = generate_pr_body(
-                    issue_number=issue_number,
-                    prompt=prompt,
-                    adw_id=adw_id,
-                    plan_path=chore_result.plan_path,
-                    model=model,
-                    working_dir=working_dir,
-                    logger=logger,
-                )
-
-                logger.info(f"Creating pull request...")
-                pr_url = create_pull_request(
-                    title=pr_title,
-                    body=pr_body,
-                    branch_name=branch_name,
-                    issue_number=issue_number,
-                    working_dir=working_dir,
-                    repo_owner=repo_owner,
-                    repo_name=repo_name,
-                    logger=logger,
-                )
-
-                if pr_url:
-                    logger.info(f"✓ Pull request created: {pr_url}")
-                else:
-                    logger.warning("⚠️ Failed to create pull request")
-            else:
-                logger.warning("⚠️ Failed to push branch")
-        else:
-            logger.warning("⚠️ Failed to commit changes (may be no changes to commit)")
+        pr_url = await asyncio.to_thread(
+            _publish_changes,
+            issue_number=issue_number,
+            issue_title=issue_title,
+            prompt=prompt,
+            adw_id=adw_id,
+            plan_path=chore_result.plan_path,
+            model=model,
+            branch_name=branch_name,
+            working_dir=working_dir,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+        )
 
     logger.info(
         f"Full workflow completed: adw_id={adw_id}, "
@@ -566,11 +645,42 @@ async def trigger_chore_implement_workflow(
 
     # Store PR URL in implement_result if available
     if pr_url and implement_result:
-        implement_result.output = f"{implement_result.output}\n\n🔗 Pull Request: {pr_url}"
+        implement_result = replace(
+            implement_result,
+            output=f"{implement_result.output}\n\n🔗 Pull Request: {pr_url}",
+        )
 
     return chore_result, implement_result
 
 
+async def _run_git(cmd: list[str], cwd: str) -> subprocess.CompletedProcess:
+    """Run a git command as an asyncio subprocess.
+
+    Unlike subprocess.run, this does not block the event loop while git runs,
+    so concurrent webhook handlers keep making progress during fetches.
+
+    Args:
+        cmd: Full command line, starting with "git"
+        cwd: Directory to run the command in
+
+    Returns:
+        CompletedProcess with decoded stdout/stderr, mirroring subprocess.run(text=True)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    return subprocess.CompletedProcess(
+        cmd,
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
 async def trigger_review_workflow(
     pr_number: int,
     repo_full_name: str,
@@ -625,88 +735,44 @@ async def trigger_review_workflow(
         f"model={model}, working_dir={working_dir}"
     )
 
-    # Track original branch for restoration
-    original_branch = None
+    # Review the PR in a disposable worktree so the server's own checkout
+    # never changes branch and needs no restoring afterwards
+    review_dir = working_dir
+    worktree_path = None
 
-    # Checkout PR branch if branch information is provided
     if pr_number and working_dir:
-        logger.info(f"   Checking out PR branch for review...")
+        logger.info(f"   Preparing PR worktree for review...")
         try:
-            # Save current branch
-            result = subprocess.run(
-                ["git", "rev-parse", "--abbrev-ref", "HEAD"],
-                capture_output=True,
-                text=True,
-                cwd=working_dir,
-            )
-            if result.returncode == 0:
-                original_branch = result.stdout.strip()
-                logger.info(f"   Current branch: {original_branch}")
-
-            # Fetch the PR from origin using GitHub's PR fetch mechanism
-            # This is more reliable than fetching by branch name
+            # GitHub's PR ref is more reliable than the branch name
             logger.info(f"   Fetching PR #{pr_number} from origin...")
-            result = subprocess.run(
-                ["git", "fetch", "origin", f"pull/{pr_number}/head:pr-{pr_number}"],
-                capture_output=True,
-                text=True,
-                cwd=working_dir,
-            )
+            result = await _run_git(["git", "fetch", "origin", f"pull/{pr_number}/head:pr-{pr_number}"], cwd=working_dir)
+            revision = f"pr-{pr_number}"
 
             if result.returncode != 0:
                 logger.warning(f"   Failed to fetch PR branch: {result.stderr}")
+                revision = None
                 # Try alternative: fetch by branch name if provided
                 if pr_head_ref:
                     logger.info(f"   Trying alternative: fetch by branch name {pr_head_ref}")
-                    result = subprocess.run(
-                        ["git", "fetch", "origin", pr_head_ref],
-                        capture_output=True,
-                        text=True,
-                        cwd=working_dir,
-                    )
+                    result = await _run_git(["git", "fetch", "origin", pr_head_ref], cwd=working_dir)
                     if result.returncode == 0:
-                        # Checkout the fetched branch
-                        result = subprocess.run(
-                            ["git", "checkout", pr_head_ref],
-                            capture_output=True,
-                            text=True,
-                            cwd=working_dir,
-                        )
-                        if result.returncode == 0:
-                            logger.info(f"   ✓ Checked out branch: {pr_head_ref}")
-                        else:
-                            logger.warning(f"   Failed to checkout {pr_head_ref}: {result.stderr}")
-            else:
-                # Checkout the PR branch we just fetched
-                logger.info(f"   Checking out pr-{pr_number}...")
-                result = subprocess.run(
-                    ["git", "checkout", f"pr-{pr_number}"],
-                    capture_output=True,
-                    text=True,
-                    cwd=working_dir,
-                )
+                        revision = f"origin/{pr_head_ref}"
+                    else:
+                        logger.warning(f"   Failed to fetch {pr_head_ref}: {result.stderr}")
 
+            if revision:
+                # Pin to the exact commit from the webhook when it is known
+                revision = pr_head_sha or revision
+                path = os.path.join(tempfile.gettempdir(), f"adw-review-{adw_id}")
+                result = await _run_git(["git", "worktree", "add", "--detach", path, revision], cwd=working_dir)
                 if result.returncode == 0:
-                    logger.info(f"   ✓ Successfully checked out pr-{pr_number}")
-
-                    # Optionally reset to specific SHA if provided
-                    if pr_head_sha:
-                        logger.info(f"   Resetting to commit {pr_head_sha[:8]}...")
-                        result = subprocess.run(
-                            ["git", "reset", "--hard", pr_head_sha],
-                            capture_output=True,
-                            text=True,
-                            cwd=working_dir,
-                        )
-                        if result.returncode == 0:
-                            logger.info(f"   ✓ Reset to {pr_head_sha[:8]}")
-                        else:
-                            logger.warning(f"   Failed to reset to SHA: {result.stderr}")
+                    worktree_path = review_dir = path
+                    logger.info(f"   ✓ Checked out {revision} in {path}")
                 else:
-                    logger.warning(f"   Failed to checkout pr-{pr_number}: {result.stderr}")
+                    logger.warning(f"   Failed to create worktree for {revision}: {result.stderr}")
 
         except Exception as e:
-            logger.warning(f"   Error during branch checkout: {e}")
+            logger.warning(f"   Error preparing PR worktree: {e}")
             # Continue anyway - review might still work if code is already present
 
     # Create the template request
@@ -716,16 +782,15 @@ async def trigger_review_workflow(
         args=[],  # /review doesn't take arguments, it reviews current git diff
         adw_id=adw_id,
         model=model,
-        working_dir=working_dir,
+        working_dir=review_dir,
     )
     logger.info(f"   Created AgentTemplateRequest: agent=reviewer, slash_command=/review")
 
     try:
         # Execute in thread pool to avoid blocking async event loop
         logger.info(f"   Executing template in thread pool...")
-        loop = asyncio.get_event_loop()
-        response: AgentPromptResponse = await loop.run_in_executor(
-            None,
+        response: AgentPromptResponse = await asyncio.get_running_loop().run_in_executor(
+            _TEMPLATE_EXECUTOR,
             execute_template,
             request
         )
@@ -769,22 +834,17 @@ async def trigger_review_workflow(
         )
 
     finally:
-        # Restore original branch if we changed it
-        if original_branch and working_dir:
-            logger.info(f"   Restoring original branch: {original_branch}")
+        # Remove the review worktree; the fetched pr-N branch is kept
+        if worktree_path:
+            logger.info(f"   Removing review worktree: {worktree_path}")
             try:
-                result = subprocess.run(
-                    ["git", "checkout", original_branch],
-                    capture_output=True,
-                    text=True,
-                    cwd=working_dir,
-                )
+                result = await _run_git(["git", "worktree", "remove", "--force", worktree_path], cwd=working_dir)
                 if result.returncode == 0:
-                    logger.info(f"   ✓ Restored to {original_branch}")
+                    logger.info(f"   ✓ Removed {worktree_path}")
                 else:
-                    logger.warning(f"   Failed to restore branch: {result.stderr}")
+                    logger.warning(f"   Failed to remove worktree: {result.stderr}")
             except Exception as e:
-                logger.warning(f"   Error restoring branch: {e}")
+                logger.warning(f"   Error removing worktree: {e}")
 
 
 def generate_adw_id() -> str:
@@ -33,7 +33,9 @@ class ServerConfig(BaseSettings):
         server_host: Host address to bind the server (default: 0.0.0.0)
         server_port: Port to run the server on (default: 8000)
         gh_wb_secret: Secret for validating GitHub webhook signatures (required)
+        webhook_max_body_bytes: Largest webhook body accepted, in bytes (default: 25 MB)
         adw_working_dir: Working directory for ADW workflow execution (default: current dir)
+        adw_background_workflows: Queue workflows and respond to webhooks immediately (default: False)
         static_files_dir: Directory for serving static frontend files (default: apps/static)
         cors_enabled: Enable CORS for frontend requests (default: True)
         cors_origins: Allowed CORS origins (default: ["*"])
@@ -57,6 +59,11 @@ class ServerConfig(BaseSettings):
         ...,  # Required field
         description="GitHub webhook secret for signature validation"
     )
+    webhook_max_body_bytes: int = Field(
+        default=25 * 1024 * 1024,  # GitHub caps webhook payloads at 25 MB
+        description="Reject webhook bodies larger than this many bytes (413)",
+        ge=1
+    )
 
     # ADW settings
     adw_working_dir: str = Field(
@@ -67,6 +74,13 @@ class ServerConfig(BaseSettings):
         default="sonnet",
         description="Default model for ADW workflows (sonnet or opus)"
     )
+    adw_background_workflows: bool = Field(
+        default=False,
+        description=(
+            "Run webhook workflows on a background worker and answer GitHub with "
+            "202 Accepted immediately (requires a long-lived server process)"
+        )
+    )
 
     # Static files
     static_files_dir: str = Field(
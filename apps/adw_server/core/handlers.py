@@ -30,14 +30,20 @@ Example:
         result = await handle_issue_event(payload)
 """
 
-import hmac
+import asyncio
 import hashlib
+import hmac
+import json
 import logging
 import subprocess
 import os
+import re
+import ssl
 import time
+from functools import lru_cache
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
+from cachetools import LRUCache, TTLCache
+from pydantic import BaseModel, ConfigDict, Field
 
 from apps.adw_server.core.adw_integration import (
     trigger_chore_workflow,
@@ -56,8 +62,44 @@ ADW_BOT_IDENTIFIER = "[ADW-AGENTS]"
 
 # Deduplication cache: Track recently processed issues to prevent duplicate workflows
 # Format: {(issue_number, workflow_type): timestamp}
-_workflow_dedup_cache: dict[tuple[int, str], float] = {}
+# Bounded and self-expiring so a busy repository cannot grow it without limit
 DEDUP_WINDOW_SECONDS = 60  # Ignore duplicate triggers within 60 seconds
+DEDUP_CACHE_MAXSIZE = 2000
+_workflow_dedup_cache: TTLCache = TTLCache(maxsize=DEDUP_CACHE_MAXSIZE, ttl=DEDUP_WINDOW_SECONDS)
+
+# Issue references in PR bodies: closes/fixes/resolves #123. Matched against the
+# lowercased body, which is several times faster than re.IGNORECASE on long text.
+_ISSUE_REFERENCE_PATTERN = re.compile(r"\b(?:closes|fixes|resolves)\s+#(\d+)")
+
+# Review output parsing: test counts and "## Heading" sections (scanned in one pass)
+_TEST_MENTION_PATTERN = re.compile(r"test", re.IGNORECASE)
+_TEST_COUNT_PATTERN = re.compile(r"(\d+)\s+(passed|failed)", re.IGNORECASE)
+_REVIEW_SECTION_PATTERN = re.compile(
+    r"^[ \t]*##+[ \t]*(.*?)[ \t]*$\n?(.*?)(?=^[ \t]*##|\Z)",
+    re.MULTILINE | re.DOTALL | re.IGNORECASE,
+)
+
+# PR link printed by the chore_implement workflow
+_PR_URL_PATTERN = re.compile(r"Pull Request: (https://[^\s]+)")
+
+# GraphQL node IDs of issues, needed to batch comments into one mutation.
+# Node IDs never change, so entries only leave the cache when it is full.
+_issue_node_id_cache: LRUCache = LRUCache(maxsize=1024)
+
+# Webhook actions that can start a workflow; every other action is a no-op
+ISSUE_TRIGGER_ACTIONS = frozenset({"opened", "labeled"})
+REVIEW_TRIGGER_ACTIONS = frozenset({"opened", "synchronize"})  # synchronize = new commits
+
+# Issue label → workflow type, in priority order: when an issue carries several
+# trigger labels the first one listed here wins (e.g. bug beats feature)
+LABEL_WORKFLOWS: dict[str, Literal["chore", "chore_implement"]] = {
+    "bug": "chore_implement",  # plan and implement immediately
+    "implement": "chore_implement",  # plan and implement immediately
+    "feature": "chore",  # plan only, await manual approval
+    "chore": "chore",
+    "plan": "chore",
+}
+_TRIGGER_LABELS = frozenset(LABEL_WORKFLOWS)
 
 # Check if GitHub CLI and token are available
 def check_github_available() -> bool:
@@ -85,10 +127,15 @@ else:
 
 
 # Pydantic models for GitHub webhook payloads
+#
+# Only the fields the handlers read are declared; the rest of GitHub's payload
+# is dropped during validation. Parsed payloads are read-only.
 
 
 class GitHubUser(BaseModel):
     """GitHub user information."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     login: str
     id: int
     type: str = "User"
@@ -96,12 +143,16 @@ class GitHubUser(BaseModel):
 
 class GitHubLabel(BaseModel):
     """GitHub label information."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     name: str
     color: str = ""
 
 
 class GitHubIssue(BaseModel):
     """GitHub issue information from webhook payload."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     number: int
     title: str
     body: Optional[str] = None
@@ -115,6 +166,8 @@ class GitHubIssue(BaseModel):
 
 class GitHubRepository(BaseModel):
     """GitHub repository information."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     name: str
     full_name: str
     html_url: str
@@ -127,6 +180,8 @@ class IssueWebhookPayload(BaseModel):
     Payload structure for 'issues' events.
     See: https://docs.github.com/en/webhooks/webhook-events-and-payloads#issues
     """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     action: str  # opened, edited, closed, reopened, labeled, unlabeled, etc.
     issue: GitHubIssue
     repository: GitHubRepository
@@ -139,6 +194,8 @@ class PullRequestWebhookPayload(BaseModel):
     Payload structure for 'pull_request' events.
     See: https://docs.github.com/en/webhooks/webhook-events-and-payloads#pull_request
     """
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     action: str  # opened, edited, closed, reopened, synchronize, etc.
     number: int
     pull_request: dict  # Simplified - can be expanded as needed
@@ -149,6 +206,18 @@ class PullRequestWebhookPayload(BaseModel):
 # Webhook signature validation
 
 
+@lru_cache(maxsize=4)
+def _keyed_hmac(secret: str) -> "hmac.HMAC":
+    """Return an HMAC-SHA256 object keyed with secret, with no data fed yet.
+
+    Callers must copy() it before updating. Passing the digest by name lets
+    hmac use OpenSSL's HMAC implementation instead of wrapping a Python hash
+    object. The single-shot hmac.digest() is no faster here: it re-keys on
+    every call, and it cannot be fed the body chunk by chunk as it streams in.
+    """
+    return hmac.new(key=secret.encode("utf-8"), digestmod="sha256")
+
+
 def validate_webhook_signature(
     payload_body: bytes,
     signature_header: Optional[str],
@@ -174,6 +243,42 @@ def validate_webhook_signature(
             secret=config.gh_wb_secret
         )
     """
+    mac = new_webhook_hmac(secret)
+    mac.update(payload_body)
+    return verify_webhook_hmac(mac, signature_header)
+
+
+def new_webhook_hmac(secret: str) -> "hmac.HMAC":
+    """Start a webhook signature check that is fed the body in chunks.
+
+    The result is a copy of the cached keyed HMAC, so the key is not
+    re-processed for every delivery.
+
+    Args:
+        secret: Configured webhook secret
+
+    Returns:
+        HMAC-SHA256 object to update() with the raw body
+
+    Example:
+        mac = new_webhook_hmac(config.gh_wb_secret)
+        async for chunk in request.stream():
+            mac.update(chunk)
+        is_valid = verify_webhook_hmac(mac, request.headers.get("X-Hub-Signature-256"))
+    """
+    return _keyed_hmac(secret).copy()
+
+
+def verify_webhook_hmac(mac: "hmac.HMAC", signature_header: Optional[str]) -> bool:
+    """Check an X-Hub-Signature-256 header against an HMAC fed the whole body.
+
+    Args:
+        mac: HMAC from new_webhook_hmac, updated with the raw request body
+        signature_header: Value of X-Hub-Signature-256 header
+
+    Returns:
+        True if signature is valid, False otherwise
+    """
     if not signature_header:
         logger.warning("No signature header provided in webhook request")
         return False
@@ -183,17 +288,17 @@ def validate_webhook_signature(
         logger.warning(f"Invalid signature header format: {signature_header}")
         return False
 
-    received_signature = signature_header[7:]  # Remove 'sha256=' prefix
-
-    # Compute expected signature
-    expected_signature = hmac.new(
-        key=secret.encode("utf-8"),
-        msg=payload_body,
-        digestmod=hashlib.sha256
-    ).hexdigest()
+    # Decode the hex once and compare the raw 32-byte digests, so the
+    # expected side is never hex-encoded. fromhex raises ValueError on
+    # anything that isn't hex, non-ASCII characters included.
+    try:
+        received_digest = bytes.fromhex(signature_header[7:])  # Remove 'sha256=' prefix
+    except ValueError:
+        logger.warning("Webhook signature is not a hex digest")
+        return False
 
     # Compare signatures using constant-time comparison to prevent timing attacks
-    is_valid = hmac.compare_digest(received_signature, expected_signature)
+    is_valid = hmac.compare_digest(received_digest, mac.digest())
 
     if not is_valid:
         logger.warning("Webhook signature validation failed")
@@ -203,6 +308,25 @@ def validate_webhook_signature(
     return is_valid
 
 
+def get_hmac_backend() -> tuple[str, bool]:
+    """Report which SHA-256 implementation webhook signatures are checked with.
+
+    CPython normally links hashlib to OpenSSL, whose SHA-256 uses the CPU's
+    SHA extensions where available. A build without it falls back to the
+    much slower built-in implementation.
+
+    Returns:
+        Tuple of (description, uses_openssl)
+
+    Example:
+        backend, uses_openssl = get_hmac_backend()
+        # Returns: ("OpenSSL 3.0.13 30 Jan 2024", True)
+    """
+    uses_openssl = hashlib.sha256.__module__ == "_hashlib"
+    backend = ssl.OPENSSL_VERSION if uses_openssl else "built-in hashlib (no OpenSSL)"
+    return backend, uses_openssl
+
+
 # Event handling
 
 
@@ -225,6 +349,20 @@ def extract_repo_info(full_name: str) -> tuple[str, str]:
     return parts[0], parts[1]
 
 
+@lru_cache(maxsize=256)
+def _parse_issue_references(pr_body: str) -> tuple[int, ...]:
+    """Scan a PR body for closing references, caching recent bodies.
+
+    Synchronize events for a PR carry the same body on every push, so
+    repeated deliveries skip the scan.
+    """
+    # Keywords must start a word ("prefixes #1" is not a reference)
+    matches = _ISSUE_REFERENCE_PATTERN.findall(pr_body.lower())
+
+    # Convert to integers and remove duplicates, keeping first-seen order
+    return tuple(dict.fromkeys(int(match) for match in matches))
+
+
 def extract_issue_references(pr_body: str) -> list[int]:
     """Extract issue references from PR body/description.
 
@@ -241,23 +379,34 @@ def extract_issue_references(pr_body: str) -> list[int]:
         issues = extract_issue_references("Closes #123 and fixes #456")
         # Returns: [123, 456]
     """
-    import re
-
-    if not pr_body:
+    # Every reference contains "#"; a substring check is far cheaper than
+    # lowercasing and scanning a long body that cannot match
+    if not pr_body or "#" not in pr_body:
         return []
 
-    # Pattern to match: closes/fixes/resolves #123
-    # Case-insensitive, supports multiple references
-    pattern = r'(?:closes|fixes|resolves)\s+#(\d+)'
-    matches = re.findall(pattern, pr_body, re.IGNORECASE)
-
-    # Convert to integers and remove duplicates
-    issue_numbers = list(set(int(match) for match in matches))
+    # Copied so callers can't alter the cached result
+    issue_numbers = list(_parse_issue_references(pr_body))
 
     logger.debug(f"Extracted issue references from PR body: {issue_numbers}")
     return issue_numbers
 
 
+def get_gh_env() -> dict[str, str]:
+    """Build the environment for `gh` CLI calls.
+
+    Copies os.environ and maps GITHUB_PAT to GH_TOKEN when it is set. Built
+    on every call, so token, PATH and proxy changes apply to the next call.
+
+    Returns:
+        Environment dict for subprocess.run(env=...)
+    """
+    env = os.environ.copy()
+    github_pat = os.getenv("GITHUB_PAT")
+    if github_pat:
+        env["GH_TOKEN"] = github_pat
+    return env
+
+
 def make_github_issue_comment(
     issue_number: int,
     comment: str,
@@ -279,11 +428,6 @@ def make_github_issue_comment(
         # Prefix comment with bot identifier
         full_comment = f"{ADW_BOT_IDENTIFIER}\n\n{comment}"
 
-        # Build GitHub env with token
-        env = os.environ.copy()
-        if os.getenv("GITHUB_PAT"):
-            env["GH_TOKEN"] = os.getenv("GITHUB_PAT")
-
         cmd = [
             "gh",
             "issue",
@@ -299,7 +443,7 @@ def make_github_issue_comment(
             cmd,
             capture_output=True,
             text=True,
-            env=env,
+            env=get_gh_env(),
             timeout=30
         )
 
@@ -310,6 +454,346 @@ def make_github_issue_comment(
         return False
 
 
+def run_gh_graphql(query: str, variables: dict[str, str]) -> Optional[dict]:
+    """Run a GraphQL document through `gh api graphql`.
+
+    GitHub answers partially failed operations with both `data` and `errors`
+    and gh then exits non-zero, so the response body is parsed regardless of
+    the exit code.
+
+    Args:
+        query: GraphQL query or mutation document
+        variables: String variables passed with -f name=value
+
+    Returns:
+        Parsed response with `data` and possibly `errors`, or None if gh
+        could not be run or returned no JSON
+    """
+    cmd = ["gh", "api", "graphql", "-f", f"query={query}"]
+    for name, value in variables.items():
+        cmd.extend(["-f", f"{name}={value}"])
+
+    try:
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            env=get_gh_env(),
+            timeout=30
+        )
+        response = json.loads(result.stdout)
+    except Exception as e:
+        logger.error(f"GitHub GraphQL request failed: {e}")
+        return None
+
+    for error in response.get("errors") or []:
+        logger.warning(f"GitHub GraphQL error: {error.get('message')}")
+    return response
+
+
+def resolve_issue_node_ids(
+    issue_numbers: list[int],
+    repo_owner: str,
+    repo_name: str,
+) -> Optional[dict[int, str]]:
+    """Look up GraphQL node IDs for issues, querying only uncached ones.
+
+    Args:
+        issue_numbers: Issues to resolve
+        repo_owner: Repository owner
+        repo_name: Repository name
+
+    Returns:
+        Mapping of issue number to node ID (issues that do not exist are
+        left out), or None if the lookup request failed
+    """
+    node_ids = {}
+    missing = []
+    for issue_number in issue_numbers:
+        node_id = _issue_node_id_cache.get((repo_owner, repo_name, issue_number))
+        if node_id is None:
+            missing.append(issue_number)
+        else:
+            node_ids[issue_number] = node_id
+
+    if not missing:
+        return node_ids
+
+    fields = "\n".join(f"i{number}: issue(number: {number}) {{ id }}" for number in missing)
+    query = (
+        "query($owner: String!, $name: String!) {\n"
+        f"repository(owner: $owner, name: $name) {{\n{fields}\n}}\n"
+        "}"
+    )
+    response = run_gh_graphql(query, {"owner": repo_owner, "name": repo_name})
+    if response is None:
+        return None
+
+    repository = (response.get("data") or {}).get("repository") or {}
+    for issue_number in missing:
+        issue = repository.get(f"i{issue_number}")
+        if issue:
+            _issue_node_id_cache[(repo_owner, repo_name, issue_number)] = issue["id"]
+            node_ids[issue_number] = issue["id"]
+    return node_ids
+
+
+def make_github_issue_comments_batch(
+    issue_numbers: list[int],
+    comment: str,
+    repo_owner: str,
+    repo_name: str,
+) -> Optional[list[Optional[str]]]:
+    """Post the same comment to several GitHub issues in one GraphQL mutation.
+
+    Each issue gets an aliased addComment field, so N comments cost one
+    request (plus one node ID lookup the first time an issue is seen)
+    instead of N `gh issue comment` calls.
+
+    Args:
+        issue_numbers: Issues to comment on
+        comment: Comment text (bot identifier is added automatically)
+        repo_owner: Repository owner
+        repo_name: Repository name
+
+    Returns:
+        Node ID of each created comment (None where posting failed) in the
+        same order as issue_numbers, or None if the batch could not be sent
+        and the caller should post one by one
+    """
+    node_ids = resolve_issue_node_ids(issue_numbers, repo_owner, repo_name)
+    if node_ids is None:
+        return None
+
+    fields = [
+        f"c{index}: addComment(input: {{subjectId: {json.dumps(node_ids[number])}, body: $body}}) "
+        "{ commentEdge { node { id } } }"
+        for index, number in enumerate(issue_numbers)
+        if number in node_ids
+    ]
+    if not fields:
+        return [None] * len(issue_numbers)
+
+    mutation = "mutation($body: String!) {\n" + "\n".join(fields) + "\n}"
+    response = run_gh_graphql(mutation, {"body": f"{ADW_BOT_IDENTIFIER}\n\n{comment}"})
+    if response is None:
+        return None
+
+    data = response.get("data") or {}
+    comment_ids = []
+    for index in range(len(issue_numbers)):
+        edge = (data.get(f"c{index}") or {}).get("commentEdge") or {}
+        comment_ids.append((edge.get("node") or {}).get("id"))
+    return comment_ids
+
+
+def update_github_issue_comments_batch(
+    comment_ids: list[str],
+    comment: str,
+) -> Optional[list[bool]]:
+    """Replace the body of several issue comments in one GraphQL mutation.
+
+    Args:
+        comment_ids: Node IDs returned by make_github_issue_comments_batch
+        comment: New comment text (bot identifier is added automatically)
+
+    Returns:
+        Per-comment success flags in the same order as comment_ids, or None
+        if the batch could not be sent
+    """
+    fields = [
+        f"u{index}: updateIssueComment(input: {{id: {json.dumps(comment_id)}, body: $body}}) "
+        "{ issueComment { id } }"
+        for index, comment_id in enumerate(comment_ids)
+    ]
+    mutation = "mutation($body: String!) {\n" + "\n".join(fields) + "\n}"
+    response = run_gh_graphql(mutation, {"body": f"{ADW_BOT_IDENTIFIER}\n\n{comment}"})
+    if response is None:
+        return None
+
+    data = response.get("data") or {}
+    return [data.get(f"u{index}") is not None for index in range(len(comment_ids))]
+
+
+def _log_posted(issue_numbers: list[int], posted: list[bool], description: str, updated: bool = False) -> None:
+    """Log the per-issue outcome of posting (or updating) a comment."""
+    done, verb = ("Updated", "update") if updated else ("Posted", "post")
+    for issue_number, success in zip(issue_numbers, posted):
+        if success:
+            logger.info(f"{done} {description} on issue #{issue_number}")
+        else:
+            logger.error(f"Failed to {verb} {description} on issue #{issue_number}")
+
+
+async def _post_comment_to_each_issue(
+    issue_numbers: list[int],
+    comment: str,
+    repo_owner: str,
+    repo_name: str,
+    description: str,
+) -> list[bool]:
+    """Post a comment with one concurrent `gh issue comment` call per issue."""
+    results = await asyncio.gather(
+        *(
+            asyncio.to_thread(
+                make_github_issue_comment,
+                issue_number=issue_number,
+                comment=comment,
+                repo_owner=repo_owner,
+                repo_name=repo_name,
+            )
+            for issue_number in issue_numbers
+        ),
+        return_exceptions=True,
+    )
+
+    posted = []
+    for issue_number, result in zip(issue_numbers, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to post {description} to issue #{issue_number}: {result}")
+            posted.append(False)
+        else:
+            posted.append(bool(result))
+    _log_posted(issue_numbers, posted, description)
+    return posted
+
+
+async def post_comment_to_issues(
+    issue_numbers: list[int],
+    comment: str,
+    repo_owner: str,
+    repo_name: str,
+    description: str = "comment",
+) -> list[bool]:
+    """Post the same comment to several GitHub issues.
+
+    Several issues are commented on with one batched GraphQL mutation. If the
+    batch cannot be sent, or there is a single issue, each post runs
+    make_github_issue_comment in a worker thread concurrently. A failure on
+    one issue is logged and does not prevent posting to the others.
+
+    Args:
+        issue_numbers: Issues to comment on
+        comment: Comment text (bot identifier is added by make_github_issue_comment)
+        repo_owner: Repository owner
+        repo_name: Repository name
+        description: Short label for log messages (e.g. "review results")
+
+    Returns:
+        List of per-issue success flags, in the same order as issue_numbers
+    """
+    if len(issue_numbers) > 1:
+        comment_ids = await asyncio.to_thread(
+            make_github_issue_comments_batch,
+            issue_numbers=issue_numbers,
+            comment=comment,
+            repo_owner=repo_owner,
+            repo_name=repo_name,
+        )
+        if comment_ids is not None:
+            posted = [comment_id is not None for comment_id in comment_ids]
+            _log_posted(issue_numbers, posted, description)
+            return posted
+        logger.warning(f"Batched {description} failed - posting to each issue separately")
+
+    return await _post_comment_to_each_issue(
+        issue_numbers, comment, repo_owner, repo_name, description
+    )
+
+
+async def post_updatable_comment_to_issues(
+    issue_numbers: list[int],
+    comment: str,
+    repo_owner: str,
+    repo_name: str,
+    description: str = "comment",
+) -> list[Optional[str]]:
+    """Post a comment that update_comment_on_issues can later rewrite.
+
+    Used for progress comments (e.g. "review started") whose final state
+    replaces them in place, so subscribers get one notification per issue
+    instead of two.
+
+    Args:
+        issue_numbers: Issues to comment on
+        comment: Comment text
+        repo_owner: Repository owner
+        repo_name: Repository name
+        description: Short label for log messages
+
+    Returns:
+        Comment node ID per issue, in the same order as issue_numbers; None
+        where the comment failed or was posted without an ID (fallback path)
+    """
+    comment_ids = await asyncio.to_thread(
+        make_github_issue_comments_batch,
+        issue_numbers=issue_numbers,
+        comment=comment,
+        repo_owner=repo_owner,
+        repo_name=repo_name,
+    )
+    if comment_ids is not None:
+        _log_posted(issue_numbers, [comment_id is not None for comment_id in comment_ids], description)
+        return comment_ids
+
+    logger.warning(f"Batched {description} failed - posting to each issue separately")
+    await _post_comment_to_each_issue(issue_numbers, comment, repo_owner, repo_name, description)
+    return [None] * len(issue_numbers)
+
+
+async def update_comment_on_issues(
+    issue_numbers: list[int],
+    comment_ids: list[Optional[str]],
+    comment: str,
+    repo_owner: str,
+    repo_name: str,
+    description: str = "comment",
+) -> list[bool]:
+    """Rewrite comments from post_updatable_comment_to_issues in place.
+
+    Issues without a comment ID, or whose update fails, get the text as a
+    new comment instead, so every issue still receives it.
+
+    Args:
+        issue_numbers: Issues the comments belong to
+        comment_ids: IDs returned by post_updatable_comment_to_issues
+        comment: New comment text
+        repo_owner: Repository owner
+        repo_name: Repository name
+        description: Short label for log messages
+
+    Returns:
+        List of per-issue success flags, in the same order as issue_numbers
+    """
+    updatable = [
+        (issue_number, comment_id)
+        for issue_number, comment_id in zip(issue_numbers, comment_ids)
+        if comment_id is not None
+    ]
+
+    updated_issues = set()
+    if updatable:
+        updated = await asyncio.to_thread(
+            update_github_issue_comments_batch,
+            comment_ids=[comment_id for _, comment_id in updatable],
+            comment=comment,
+        )
+        if updated is None:
+            updated = [False] * len(updatable)
+        updated_issues = {
+            issue_number for (issue_number, _), success in zip(updatable, updated) if success
+        }
+        _log_posted([issue_number for issue_number, _ in updatable], updated, description, updated=True)
+
+    remaining = [issue_number for issue_number in issue_numbers if issue_number not in updated_issues]
+    posted = {}
+    if remaining:
+        results = await post_comment_to_issues(remaining, comment, repo_owner, repo_name, description)
+        posted = dict(zip(remaining, results))
+
+    return [issue_number in updated_issues or posted.get(issue_number, False) for issue_number in issue_numbers]
+
+
 def post_workflow_comment(
     issue_number: int,
     repo_full_name: str,
@@ -362,6 +846,21 @@ def get_label_names(issue: GitHubIssue) -> list[str]:
     return [label.name for label in issue.labels]
 
 
+def get_trigger_label(issue: GitHubIssue) -> Optional[str]:
+    """Return the highest-priority workflow label on an issue.
+
+    Args:
+        issue: GitHub issue object
+
+    Returns:
+        Label name from LABEL_WORKFLOWS, or None if the issue has none
+    """
+    labels = {label.name for label in issue.labels}
+    if labels.isdisjoint(_TRIGGER_LABELS):
+        return None
+    return next(label for label in LABEL_WORKFLOWS if label in labels)
+
+
 def should_trigger_workflow(
     issue_number: int,
     workflow_type: str,
@@ -381,17 +880,11 @@ def should_trigger_workflow(
     cache_key = (issue_number, workflow_type)
     current_time = time.time()
 
-    # Clean old entries from cache (older than dedup window)
-    expired_keys = [
-        key for key, timestamp in _workflow_dedup_cache.items()
-        if current_time - timestamp > DEDUP_WINDOW_SECONDS
-    ]
-    for key in expired_keys:
-        del _workflow_dedup_cache[key]
-
-    # Check if this workflow was recently triggered
-    if cache_key in _workflow_dedup_cache:
-        last_trigger = _workflow_dedup_cache[cache_key]
+    # Expired entries are evicted by the TTL cache itself; the timestamp check
+    # below still guards entries whose stored trigger time is already stale.
+    # No lock is needed: the check and insert run without awaiting in between.
+    last_trigger = _workflow_dedup_cache.get(cache_key)
+    if last_trigger is not None:
         time_since = current_time - last_trigger
         if time_since < DEDUP_WINDOW_SECONDS:
             logger.warning(
@@ -436,7 +929,7 @@ def determine_workflow_for_issue(
             workflow_type, prompt = workflow
     """
     # Only trigger on opened or labeled actions
-    if action not in ["opened", "labeled"]:
+    if action not in ISSUE_TRIGGER_ACTIONS:
         logger.debug(f"Skipping issue #{issue.number} action: {action}")
         return None
 
@@ -451,33 +944,14 @@ def determine_workflow_for_issue(
         prompt += f"\n\n{body_preview}"
 
     # Determine workflow based on labels
-    workflow_type = None
-
-    if "bug" in labels:
-        # Bug issues get immediate implementation
-        workflow_type = "chore_implement"
-        logger.info(f"Issue #{issue.number} is a bug - workflow: {workflow_type}")
-
-    elif "implement" in labels:
-        # Implement label triggers full workflow (plan + implement)
-        workflow_type = "chore_implement"
-        logger.info(f"Issue #{issue.number} has implement label - workflow: {workflow_type}")
-
-    elif "feature" in labels:
-        # Feature issues get planning only (manual approval for implementation)
-        workflow_type = "chore"
-        logger.info(f"Issue #{issue.number} is a feature - workflow: {workflow_type}")
-
-    elif "chore" in labels or "plan" in labels:
-        # Chore/plan issues get planning only
-        workflow_type = "chore"
-        logger.info(f"Issue #{issue.number} is a chore/plan - workflow: {workflow_type}")
-
-    else:
-        # No matching labels
+    trigger_label = get_trigger_label(issue)
+    if trigger_label is None:
         logger.info(f"Issue #{issue.number} has no matching labels - skipping workflow")
         return None
 
+    workflow_type = LABEL_WORKFLOWS[trigger_label]
+    logger.info(f"Issue #{issue.number} has {trigger_label} label - workflow: {workflow_type}")
+
     # Check deduplication cache before triggering
     if not should_trigger_workflow(issue.number, workflow_type):
         return None
@@ -531,12 +1005,7 @@ async def handle_issue_event(
     adw_id = generate_adw_id()
 
     # Get label that triggered the workflow
-    labels = get_label_names(issue)
-    trigger_label = None
-    for label in ["bug", "implement", "feature", "chore", "plan"]:
-        if label in labels:
-            trigger_label = label
-            break
+    trigger_label = get_trigger_label(issue)
 
     logger.info(
         f"Triggering {workflow_type} workflow for issue #{issue.number}, "
@@ -546,7 +1015,8 @@ async def handle_issue_event(
     # Post initial comment about workflow detection
     repo_full_name = payload.repository.full_name
     logger.info(f"📝 Posting initial workflow comment to issue #{issue.number}")
-    comment_posted = post_workflow_comment(
+    comment_posted = await asyncio.to_thread(
+        post_workflow_comment,
         issue.number,
         repo_full_name,
         f"🤖 **Workflow Detected: `{trigger_label}` label**\n\n"
@@ -578,7 +1048,8 @@ async def handle_issue_event(
             error_details = str(e)
             error_type = type(e).__name__
 
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"💥 **Workflow Error**\n\n"
@@ -603,7 +1074,8 @@ async def handle_issue_event(
         # Post completion comment
         logger.info(f"📝 Posting chore completion comment to issue #{issue.number}")
         if result.success:
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"✅ **Planning Complete**\n\n"
@@ -613,7 +1085,8 @@ async def handle_issue_event(
             )
             logger.info(f"   Completion comment posted: {comment_posted}")
         else:
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"❌ **Planning Failed**\n\n"
@@ -662,7 +1135,8 @@ async def handle_issue_event(
             error_details = str(e)
             error_type = type(e).__name__
 
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"💥 **Workflow Error**\n\n"
@@ -690,8 +1164,7 @@ async def handle_issue_event(
             # Check if PR URL is in output
             pr_url = None
             if impl_result.output and "Pull Request:" in impl_result.output:
-                import re
-                match = re.search(r"Pull Request: (https://[^\s]+)", impl_result.output)
+                match = _PR_URL_PATTERN.search(impl_result.output)
                 if match:
                     pr_url = match.group(1)
 
@@ -726,14 +1199,16 @@ async def handle_issue_event(
                     f"⚠️ **Note:** PR creation was not attempted or failed. Please review the changes manually."
                 )
 
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 comment_text
             )
             logger.info(f"   Success comment posted: {comment_posted}")
         elif chore_result.success and (not impl_result or not impl_result.success):
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"⚠️ **Partial Success**\n\n"
@@ -745,7 +1220,8 @@ async def handle_issue_event(
             )
             logger.info(f"   Partial success comment posted: {comment_posted}")
         else:
-            comment_posted = post_workflow_comment(
+            comment_posted = await asyncio.to_thread(
+                post_workflow_comment,
                 issue.number,
                 repo_full_name,
                 f"❌ **Workflow Failed**\n\n"
@@ -776,6 +1252,41 @@ async def handle_issue_event(
     }
 
 
+def fetch_issue_context(issue_number: int, repo_full_name: str) -> tuple[str, str]:
+    """Fetch an issue's title and a prompt built from its title and body.
+
+    Used as context when a review asks for re-implementation. Failures are
+    logged and yield empty strings so callers can fall back to a default.
+
+    Args:
+        issue_number: Issue to fetch
+        repo_full_name: Repository in "owner/repo" format
+
+    Returns:
+        Tuple of (issue title, prompt with the title as a heading over the body)
+    """
+    try:
+        logger.info(f"Fetching issue #{issue_number} details for context")
+        result = subprocess.run(
+            ["gh", "issue", "view", str(issue_number), "--json", "title,body", "--repo", repo_full_name],
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+        if result.returncode != 0:
+            logger.warning(f"Failed to fetch issue #{issue_number}: {result.stderr}")
+            return "", ""
+        issue_data = json.loads(result.stdout)
+    except Exception as e:
+        logger.warning(f"Error fetching issue details: {e}")
+        return "", ""
+
+    issue_title = issue_data.get("title", "")
+    issue_body = issue_data.get("body", "")
+    logger.info(f"Fetched issue #{issue_number} context successfully")
+    return issue_title, f"# {issue_title}\n\n{issue_body}"
+
+
 async def handle_pull_request_event(
     payload: PullRequestWebhookPayload,
     working_dir: Optional[str] = None,
@@ -807,7 +1318,7 @@ async def handle_pull_request_event(
     )
 
     # Only trigger review for opened and synchronize (new commits) actions
-    if action not in ["opened", "synchronize"]:
+    if action not in REVIEW_TRIGGER_ACTIONS:
         logger.info(f"Skipping PR review for action: {action}")
         return {
             "workflow_triggered": False,
@@ -850,23 +1361,16 @@ async def handle_pull_request_event(
         }
 
     # Post initial comment to issue thread(s) indicating review has started
-    for issue_number in issue_numbers:
-        initial_comment = (
-            f"🔍 **Pull Request Review Started**\n\n"
-            f"**PR:** [#{pr_number}]({pr_html_url})\n"
-            f"**ADW ID:** `{adw_id}`\n\n"
-            f"Automated review is in progress. Results will be posted shortly..."
-        )
-        try:
-            make_github_issue_comment(
-                issue_number=issue_number,
-                comment=initial_comment,
-                repo_owner=repo_owner,
-                repo_name=repo_name,
-            )
-            logger.info(f"Posted review start comment to issue #{issue_number}")
-        except Exception as e:
-            logger.warning(f"Failed to post initial comment to issue #{issue_number}: {e}")
+    initial_comment = (
+        f"🔍 **Pull Request Review Started**\n\n"
+        f"**PR:** [#{pr_number}]({pr_html_url})\n"
+        f"**ADW ID:** `{adw_id}`\n\n"
+        f"Automated review is in progress. Results will be posted shortly..."
+    )
+    # Kept updatable so the results (or error) replace it in place
+    start_comment_ids = await post_updatable_comment_to_issues(
+        issue_numbers, initial_comment, repo_owner, repo_name, "review start comment"
+    )
 
     # Extract PR branch information
     pr_head_ref = payload.pull_request.get("head", {}).get("ref", "")
@@ -897,43 +1401,14 @@ async def handle_pull_request_event(
             adw_id=adw_id,
         )
 
-        # Post review results to all linked issues
-        for issue_number in issue_numbers:
-            try:
-                make_github_issue_comment(
-                    issue_number=issue_number,
-                    comment=review_comment,
-                    repo_owner=repo_owner,
-                    repo_name=repo_name,
-                )
-                logger.info(f"Posted review results to issue #{issue_number}")
-            except Exception as e:
-                logger.error(f"Failed to post review results to issue #{issue_number}: {e}")
-
-        # Fetch issue details for re-implementation context
-        original_prompt = ""
-        issue_title_text = ""
-        if issue_numbers:
-            primary_issue = issue_numbers[0]
-            try:
-                logger.info(f"Fetching issue #{primary_issue} details for context")
-                result = subprocess.run(
-                    ["gh", "issue", "view", str(primary_issue), "--json", "title,body", "--repo", repo_full_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode == 0:
-                    import json
-                    issue_data = json.loads(result.stdout)
-                    issue_title_text = issue_data.get("title", "")
-                    issue_body = issue_data.get("body", "")
-                    original_prompt = f"# {issue_title_text}\n\n{issue_body}"
-                    logger.info(f"Fetched issue #{primary_issue} context successfully")
-                else:
-                    logger.warning(f"Failed to fetch issue #{primary_issue}: {result.stderr}")
-            except Exception as e:
-                logger.warning(f"Error fetching issue details: {e}")
+        # Replace the start comment on all linked issues with the review
+        # results while fetching the primary issue for re-implementation context
+        _, (issue_title_text, original_prompt) = await asyncio.gather(
+            update_comment_on_issues(
+                issue_numbers, start_comment_ids, review_comment, repo_owner, repo_name, "review results"
+            ),
+            asyncio.to_thread(fetch_issue_context, issue_numbers[0], repo_full_name),
+        )
 
         # Handle review results (merge, re-implement, or comment)
         try:
@@ -990,17 +1465,9 @@ async def handle_pull_request_event(
             f"Please check the logs for details: `agents/{adw_id}/reviewer/`"
         )
 
-        for issue_number in issue_numbers:
-            try:
-                make_github_issue_comment(
-                    issue_number=issue_number,
-                    comment=error_comment,
-                    repo_owner=repo_owner,
-                    repo_name=repo_name,
-                )
-                logger.info(f"Posted error comment to issue #{issue_number}")
-            except Exception as post_error:
-                logger.error(f"Failed to post error comment to issue #{issue_number}: {post_error}")
+        await update_comment_on_issues(
+            issue_numbers, start_comment_ids, error_comment, repo_owner, repo_name, "error comment"
+        )
 
         return {
             "workflow_triggered": True,
@@ -1044,18 +1511,18 @@ def format_review_results(
     """
     # Parse review output for key information
     # Look for test results, review status, etc.
-    import re
 
     # Try to extract test results from output
     test_summary = ""
-    if "test" in review_output.lower():
-        # Look for common test result patterns
-        test_match = re.search(r'(\d+)\s+passed', review_output, re.IGNORECASE)
-        fail_match = re.search(r'(\d+)\s+failed', review_output, re.IGNORECASE)
-
-        if test_match or fail_match:
-            passed = test_match.group(1) if test_match else "0"
-            failed = fail_match.group(1) if fail_match else "0"
+    if _TEST_MENTION_PATTERN.search(review_output):
+        # Take the first "N passed" and first "N failed" from a single scan
+        counts: dict[str, str] = {}
+        for count, outcome in _TEST_COUNT_PATTERN.findall(review_output):
+            counts.setdefault(outcome.lower(), count)
+
+        if counts:
+            passed = counts.get("passed", "0")
+            failed = counts.get("failed", "0")
             test_summary = f"\n### Test Results\n✅ {passed} passed | ❌ {failed} failed\n"
 
     # Try to extract approval status
@@ -1083,10 +1550,15 @@ def format_review_results(
     # Add review summary (truncate if too long)
     comment_parts.append("\n### Review Summary\n")
 
+    # Split review output into its "## Heading" sections in a single scan,
+    # keeping the first occurrence of each heading
+    sections: dict[str, str] = {}
+    for heading, content in _REVIEW_SECTION_PATTERN.findall(review_output):
+        sections.setdefault(heading.lower(), content)
+
     # Try to extract summary section from review output
-    summary_match = re.search(r'## Summary\s*\n(.*?)(?=\n##|\Z)', review_output, re.DOTALL | re.IGNORECASE)
-    if summary_match:
-        summary_text = summary_match.group(1).strip()
+    if "summary" in sections:
+        summary_text = sections["summary"].strip()
         # Truncate if too long
         if len(summary_text) > 500:
             summary_text = summary_text[:500] + "...\n\n_See full review output for details._"
@@ -1096,8 +1568,7 @@ def format_review_results(
         comment_parts.append("Code review completed. Check the review output for details.\n")
 
     # Add metadata section
-    comment_parts.append(f"\n---\n")
-    comment_parts.append(f"🤖 Automated review by ADW • Logs: `agents/{adw_id}/reviewer/`\n")
+    comment_parts.append(f"\n---\n🤖 Automated review by ADW • Logs: `agents/{adw_id}/reviewer/`\n")
 
     return ''.join(comment_parts)
 
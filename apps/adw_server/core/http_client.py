@@ -0,0 +1,59 @@
+"""Shared HTTP client for direct GitHub REST API calls.
+
+Most GitHub calls go through the `gh` CLI. The few made over HTTPS
+(merging an approved pull request) share one httpx.Client, so repeated calls
+reuse a kept-alive TLS connection instead of handshaking each time.
+httpx.Client is safe to use from several threads, which matters because
+those calls run in asyncio.to_thread workers.
+
+The token is sent per request rather than baked into the client, so a
+rotated GITHUB_PAT takes effect without restarting the server.
+
+Example:
+    response = get_github_client().put(
+        "/repos/myorg/myrepo/pulls/42/merge",
+        json={"merge_method": "squash"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    ...
+    close_github_client()  # on server shutdown
+"""
+
+import threading
+from typing import Optional
+
+import httpx
+
+# Base URL for GitHub REST API requests made with the shared client
+GITHUB_API_URL = "https://api.github.com"
+
+# Created on first use so importing this module never opens sockets
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_github_client() -> httpx.Client:
+    """Return the shared GitHub API client, creating it on first use.
+
+    Returns:
+        httpx.Client with the GitHub API base URL and a 30 second timeout
+    """
+    global _client
+    with _client_lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(
+                base_url=GITHUB_API_URL,
+                timeout=30,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                headers={"Accept": "application/vnd.github+json"},
+            )
+        return _client
+
+
+def close_github_client() -> None:
+    """Close the shared client and its pooled connections, if it was created."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
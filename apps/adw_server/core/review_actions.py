@@ -7,20 +7,56 @@ This module provides functionality for handling PR review results, including:
 - Posting status comments to GitHub issues
 """
 
+import asyncio
 import logging
 import os
 import re
 import subprocess
+import threading
+from functools import lru_cache
 from typing import Optional
 
+import httpx
+from cachetools import LRUCache
+
 from apps.adw_server.core.adw_integration import WorkflowResult, trigger_chore_implement_workflow
 from apps.adw_server.core.config import get_config
+from apps.adw_server.core.http_client import get_github_client
 
 logger = logging.getLogger(__name__)
 
+# Review output parsing patterns, compiled once at import
+# Use negative lookahead to avoid matching ### sections as ## sections
+_ISSUES_SECTION_PATTERN = re.compile(r'##\s*Issues\s*Found\s*\n(.*?)(?=\n##(?!#)|\Z)', re.DOTALL | re.IGNORECASE)
+# All three severity subsections are found in one finditer pass
+_SEVERITY_SECTION_PATTERN = re.compile(
+    r'###\s*(Critical|Moderate|Minor)\s*\n(.*?)(?=###|\n##|\Z)', re.DOTALL | re.IGNORECASE
+)
+# Severity names keyed by their lowercased heading text. Looking the matched
+# heading up here hands back these interned literals instead of building a new
+# string with capitalize() for every section.
+_SEVERITY_NAMES = {"critical": "Critical", "moderate": "Moderate", "minor": "Minor"}
+_ISSUE_ITEM_PATTERN = re.compile(r'(?:^|\n)\s*(?:-|\*|\d+\.)\s*(.+)')
+
+# Approval statuses keyed by their letters only, uppercased (so
+# "[ Changes Requested ]" and "CHANGES_REQUESTED" both give CHANGESREQUESTED)
+_APPROVAL_STATUSES = {
+    "APPROVED": "APPROVED",
+    "CHANGESREQUESTED": "CHANGES_REQUESTED",
+    "NEEDSDISCUSSION": "NEEDS_DISCUSSION",
+}
+
+# "## Heading" names (lowercased, spaces removed) whose body parse_review_status keeps
+_REVIEW_STATUS_SECTIONS = frozenset({"summary", "recommendations"})
+
 # Re-implementation attempt tracking (in-memory)
-# Maps issue_number -> attempt_count
-_reimplement_attempts: dict[int, int] = {}
+# Maps issue_number -> attempt_count. Bounded so a long-running server does
+# not keep a count for every issue it has ever seen; the least recently used
+# issues are forgotten first.
+REIMPLEMENT_ATTEMPTS_MAXSIZE = 4096
+_reimplement_attempts: LRUCache = LRUCache(maxsize=REIMPLEMENT_ATTEMPTS_MAXSIZE)
+# LRUCache reorders entries even on reads, so every access takes the lock
+_reimplement_lock = threading.Lock()
 
 
 def check_reimplement_attempts(issue_number: int, max_attempts: int = 3) -> tuple[bool, int]:
@@ -40,7 +76,8 @@ def check_reimplement_attempts(issue_number: int, max_attempts: int = 3) -> tupl
         if not allowed:
             logger.warning(f"Max attempts reached: {count}")
     """
-    current_count = _reimplement_attempts.get(issue_number, 0)
+    with _reimplement_lock:
+        current_count = _reimplement_attempts.get(issue_number, 0)
     allowed = current_count < max_attempts
     return allowed, current_count
 
@@ -58,9 +95,9 @@ def increment_reimplement_attempts(issue_number: int) -> int:
         new_count = increment_reimplement_attempts(42)
         logger.info(f"Re-implementation attempt {new_count} started")
     """
-    current_count = _reimplement_attempts.get(issue_number, 0)
-    new_count = current_count + 1
-    _reimplement_attempts[issue_number] = new_count
+    with _reimplement_lock:
+        new_count = _reimplement_attempts.get(issue_number, 0) + 1
+        _reimplement_attempts[issue_number] = new_count
     logger.info(f"Incremented re-implementation attempts for issue #{issue_number}: {new_count}")
     return new_count
 
@@ -76,14 +113,140 @@ def reset_reimplement_attempts(issue_number: int) -> None:
     Example:
         reset_reimplement_attempts(42)
     """
-    if issue_number in _reimplement_attempts:
-        del _reimplement_attempts[issue_number]
+    with _reimplement_lock:
+        removed = _reimplement_attempts.pop(issue_number, None) is not None
+    if removed:
         logger.info(f"Reset re-implementation attempts for issue #{issue_number}")
 
 
+def _parse_approval_status(line: str) -> Optional[str]:
+    """Return the status named on an "## Approval Status" line, if any."""
+    key = "".join(filter(str.isalpha, line)).upper()
+    status = _APPROVAL_STATUSES.get(key)
+    if status is None:
+        # The status may be followed by a note ("APPROVED - minor nits")
+        for prefix, name in _APPROVAL_STATUSES.items():
+            if key.startswith(prefix):
+                return name
+    return status
+
+
+def _list_item_text(line: str) -> Optional[str]:
+    """Return the text of a "-", "*" or "1." list item line, or None."""
+    text = line.strip()
+    if text[:1] in ("-", "*"):
+        return text[1:].strip()
+    digits = len(text) - len(text.lstrip("0123456789"))
+    if digits and text[digits:digits + 1] == ".":
+        return text[digits + 1:].strip()
+    return None
+
+
+def _scan_review_status(review_output: str) -> tuple[str, str, tuple[str, ...]]:
+    """Read approval status, summary and recommendations in one line pass.
+
+    A line starting with "##" opens a section; the first Summary and
+    Recommendations sections are kept, and the first non-blank line under
+    "## Approval Status" gives the status.
+    """
+    approval_status = None
+    sections: dict[str, list[str]] = {}
+    section_lines = None
+    awaiting_status = False
+
+    for line in review_output.splitlines():
+        stripped = line.strip()
+
+        if stripped.startswith("##"):
+            name = "".join(stripped.lstrip("#").split()).lower()
+            awaiting_status = approval_status is None and name == "approvalstatus"
+            section_lines = None
+            if name in _REVIEW_STATUS_SECTIONS and name not in sections:
+                section_lines = sections[name] = []
+            continue
+
+        if awaiting_status and stripped:
+            # Parse approval status - looking for format: ## Approval Status\n[STATUS]
+            approval_status = _parse_approval_status(stripped)
+            awaiting_status = False
+
+        if section_lines is not None:
+            section_lines.append(line)
+
+    if approval_status is None:
+        # Fallback: look for status keywords anywhere in output
+        if "APPROVED" in review_output:
+            approval_status = "APPROVED"
+        elif "CHANGES REQUESTED" in review_output or "CHANGES_REQUESTED" in review_output:
+            approval_status = "CHANGES_REQUESTED"
+        else:
+            approval_status = "NEEDS_DISCUSSION"
+
+    summary = "\n".join(sections.get("summary", ())).strip()
+
+    # Parse numbered or bulleted list
+    recommendations = []
+    for line in sections.get("recommendations", ()):
+        item = _list_item_text(line)
+        if item:
+            recommendations.append(item)
+
+    return approval_status, summary, tuple(recommendations)
+
+
+def _scan_review_issues(review_output: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
+    """Find the "## Issues Found" items, as (severity, items) pairs."""
+    issues = dict.fromkeys(_SEVERITY_NAMES.values(), ())
+
+    # Look for ## Issues Found section
+    issues_match = _ISSUES_SECTION_PATTERN.search(review_output)
+
+    if not issues_match:
+        return tuple(issues.items())
+
+    issues_text = issues_match.group(1)
+
+    # Extract each severity section; only the first of each severity counts
+    seen = set()
+    for severity_match in _SEVERITY_SECTION_PATTERN.finditer(issues_text):
+        severity = _SEVERITY_NAMES[severity_match.group(1).lower()]
+        if severity in seen:
+            continue
+        seen.add(severity)
+
+        severity_text = severity_match.group(2).strip()
+        # Skip if it's just "None"
+        if severity_text.lower() == "none":
+            continue
+        # Parse bulleted or numbered items
+        issue_items = _ISSUE_ITEM_PATTERN.findall(severity_text)
+        issues[severity] = tuple(item.strip() for item in issue_items if item.strip())
+
+    return tuple(issues.items())
+
+
+@lru_cache(maxsize=256)
+def _parse_review_cached(review_output: str) -> tuple:
+    """Parse a review output once, caching recent outputs.
+
+    A review handled again on a webhook retry carries the same output, and
+    handle_review_results asks for both the status and the issues, so each
+    output is scanned only once. Results are tuples so the cached value
+    cannot be changed by callers.
+
+    Returns:
+        Tuple of (approval_status, summary, recommendations, issues)
+    """
+    approval_status, summary, recommendations = _scan_review_status(review_output)
+    return approval_status, summary, recommendations, _scan_review_issues(review_output)
+
+
 def parse_review_status(review_output: str) -> tuple[str, str, list[str]]:
     """Parse review output to extract approval status, summary, and recommendations.
 
+    Recently parsed outputs are cached, so calling this again with the same
+    output (or calling extract_review_issues on it) does not rescan it.
+
     Args:
         review_output: The full output from the review workflow
 
@@ -98,48 +261,8 @@ def parse_review_status(review_output: str) -> tuple[str, str, list[str]]:
         if status == "APPROVED":
             merge_pull_request(pr_number, repo_owner, repo_name)
     """
-    # Default values
-    approval_status = "NEEDS_DISCUSSION"
-    summary = ""
-    recommendations = []
-
-    # Parse approval status - looking for format: ## Approval Status\n[STATUS]
-    approval_pattern = r'##\s*Approval\s*Status\s*\n\s*\[?\s*(APPROVED|CHANGES\s*REQUESTED|NEEDS\s*DISCUSSION)\s*\]?'
-    approval_match = re.search(approval_pattern, review_output, re.IGNORECASE)
-
-    if approval_match:
-        status_text = approval_match.group(1).upper().replace(" ", "_")
-        if "APPROVED" in status_text:
-            approval_status = "APPROVED"
-        elif "CHANGES" in status_text:
-            approval_status = "CHANGES_REQUESTED"
-        elif "NEEDS" in status_text or "DISCUSSION" in status_text:
-            approval_status = "NEEDS_DISCUSSION"
-    else:
-        # Fallback: look for status keywords anywhere in output
-        if "APPROVED" in review_output:
-            approval_status = "APPROVED"
-        elif "CHANGES REQUESTED" in review_output or "CHANGES_REQUESTED" in review_output:
-            approval_status = "CHANGES_REQUESTED"
-
-    # Extract summary section
-    summary_pattern = r'##\s*Summary\s*\n(.*?)(?=\n##|\Z)'
-    summary_match = re.search(summary_pattern, review_output, re.DOTALL | re.IGNORECASE)
-
-    if summary_match:
-        summary = summary_match.group(1).strip()
-
-    # Extract recommendations
-    recommendations_pattern = r'##\s*Recommendations\s*\n(.*?)(?=\n##|\Z)'
-    recommendations_match = re.search(recommendations_pattern, review_output, re.DOTALL | re.IGNORECASE)
-
-    if recommendations_match:
-        recs_text = recommendations_match.group(1).strip()
-        # Parse numbered or bulleted list
-        rec_items = re.findall(r'(?:^|\n)\s*(?:\d+\.|-|\*)\s*(.+)', recs_text)
-        recommendations = [rec.strip() for rec in rec_items if rec.strip()]
-
-    return approval_status, summary, recommendations
+    approval_status, summary, recommendations, _ = _parse_review_cached(review_output)
+    return approval_status, summary, list(recommendations)
 
 
 def extract_review_issues(review_output: str) -> dict[str, list[str]]:
@@ -157,37 +280,39 @@ def extract_review_issues(review_output: str) -> dict[str, list[str]]:
         if issues["Critical"]:
             logger.error(f"Found {len(issues['Critical'])} critical issues")
     """
-    issues = {
-        "Critical": [],
-        "Moderate": [],
-        "Minor": []
-    }
-
-    # Look for ## Issues Found section
-    # Use negative lookahead to avoid matching ### sections as ## sections
-    issues_section_pattern = r'##\s*Issues\s*Found\s*\n(.*?)(?=\n##(?!#)|\Z)'
-    issues_match = re.search(issues_section_pattern, review_output, re.DOTALL | re.IGNORECASE)
-
-    if not issues_match:
-        return issues
-
-    issues_text = issues_match.group(1)
-
-    # Extract each severity section
-    for severity in ["Critical", "Moderate", "Minor"]:
-        severity_pattern = rf'###\s*{severity}\s*\n(.*?)(?=###|\n##|\Z)'
-        severity_match = re.search(severity_pattern, issues_text, re.DOTALL | re.IGNORECASE)
-
-        if severity_match:
-            severity_text = severity_match.group(1).strip()
-            # Skip if it's just "None"
-            if severity_text.lower() == "none":
-                continue
-            # Parse bulleted or numbered items
-            issue_items = re.findall(r'(?:^|\n)\s*(?:-|\*|\d+\.)\s*(.+)', severity_text)
-            issues[severity] = [item.strip() for item in issue_items if item.strip()]
+    _, _, _, issues = _parse_review_cached(review_output)
+    return {severity: list(items) for severity, items in issues}
+
+
+def _github_token() -> Optional[str]:
+    """Return the GitHub token from the environment, if one is set."""
+    return os.getenv("GITHUB_PAT") or os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")
+
+
+def _merge_with_gh(pr_number: int, repo_full_name: str, merge_method: str, logger: logging.Logger) -> bool:
+    """Merge (or queue auto-merge for) a pull request with `gh pr merge --auto`."""
+    # Build gh pr merge command
+    cmd = [
+        "gh", "pr", "merge", str(pr_number),
+        "--repo", repo_full_name,
+        f"--{merge_method}",
+        "--auto",  # Merge when all checks pass
+    ]
+
+    # Execute merge command
+    result = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
 
-    return issues
+    if result.returncode == 0:
+        logger.info(f"✓ Successfully merged PR #{pr_number}")
+        return True
+    else:
+        logger.error(f"Failed to merge PR #{pr_number}: {result.stderr}")
+        return False
 
 
 def merge_pull_request(
@@ -197,7 +322,14 @@ def merge_pull_request(
     merge_method: str = "squash",
     logger: Optional[logging.Logger] = None
 ) -> bool:
-    """Merge a pull request using GitHub CLI.
+    """Merge a pull request through the GitHub REST API.
+
+    With a token in the environment the merge is a single
+    PUT /repos/{owner}/{repo}/pulls/{number}/merge request, which avoids
+    starting the `gh` CLI. GitHub answers 405 when the pull request cannot
+    be merged yet (for example while required checks are pending); that
+    case, and a missing token, fall back to `gh pr merge --auto` so the
+    merge still happens once the checks pass.
 
     Args:
         pr_number: Pull request number to merge
@@ -222,30 +354,27 @@ def merge_pull_request(
     logger.info(f"Attempting to merge PR #{pr_number} in {repo_full_name} using {merge_method} method")
 
     try:
-        # Build gh pr merge command
-        cmd = [
-            "gh", "pr", "merge", str(pr_number),
-            "--repo", repo_full_name,
-            f"--{merge_method}",
-            "--auto",  # Merge when all checks pass
-        ]
-
-        # Execute merge command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=30,
+        token = _github_token()
+        if not token:
+            return _merge_with_gh(pr_number, repo_full_name, merge_method, logger)
+
+        response = get_github_client().put(
+            f"/repos/{repo_full_name}/pulls/{pr_number}/merge",
+            json={"merge_method": merge_method},
+            headers={"Authorization": f"Bearer {token}"},
         )
 
-        if result.returncode == 0:
+        if response.status_code == 200:
             logger.info(f"✓ Successfully merged PR #{pr_number}")
             return True
-        else:
-            logger.error(f"Failed to merge PR #{pr_number}: {result.stderr}")
-            return False
+        if response.status_code == 405:
+            logger.info(f"PR #{pr_number} is not mergeable yet, enabling auto-merge")
+            return _merge_with_gh(pr_number, repo_full_name, merge_method, logger)
+
+        logger.error(f"Failed to merge PR #{pr_number}: {response.status_code} {response.text}")
+        return False
 
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, httpx.TimeoutException):
         logger.error(f"Timeout while merging PR #{pr_number}")
         return False
     except Exception as e:
@@ -368,6 +497,9 @@ async def handle_review_results(
         )
         print(f"Action: {result['action']}, Success: {result['success']}")
     """
+    # Imported here: handlers imports this module
+    from apps.adw_server.core.handlers import post_comment_to_issues
+
     if logger is None:
         logger = logging.getLogger(__name__)
 
@@ -406,7 +538,9 @@ async def handle_review_results(
     if approval_status == "APPROVED" and auto_merge_enabled:
         # Merge the PR
         logger.info(f"Review approved, attempting to merge PR #{pr_number}")
-        merge_success = merge_pull_request(pr_number, repo_owner, repo_name, merge_method=merge_method, logger=logger)
+        merge_success = await asyncio.to_thread(
+            merge_pull_request, pr_number, repo_owner, repo_name, merge_method=merge_method, logger=logger
+        )
         result["success"] = merge_success
         result["merge_attempted"] = True
 
@@ -415,20 +549,20 @@ async def handle_review_results(
             for issue_num in issue_numbers:
                 reset_reimplement_attempts(issue_num)
 
-        # Post comment about merge status
-        for issue_num in issue_numbers:
-            try:
-                post_merge_comment(
-                    issue_number=issue_num,
-                    repo_full_name=repo_full_name,
-                    pr_number=pr_number,
-                    pr_url=f"https://github.com/{repo_full_name}/pull/{pr_number}",
-                    adw_id=review_result.adw_id,
-                    merge_success=merge_success,
-                    error_message=None if merge_success else "Merge failed",
-                )
-            except Exception as e:
-                logger.error(f"Failed to post merge comment to issue #{issue_num}: {e}")
+        # Post comment about merge status, batched across the linked issues
+        await post_comment_to_issues(
+            issue_numbers,
+            format_merge_comment(
+                pr_number=pr_number,
+                pr_url=f"https://github.com/{repo_full_name}/pull/{pr_number}",
+                adw_id=review_result.adw_id,
+                merge_success=merge_success,
+                error_message=None if merge_success else "Merge failed",
+            ),
+            repo_owner,
+            repo_name,
+            description="merge status comment",
+        )
 
     elif approval_status == "CHANGES_REQUESTED" and auto_reimplement_enabled:
         # Check loop protection
@@ -448,8 +582,6 @@ async def handle_review_results(
             result["attempt_count"] = current_count
 
             # Post comment about max attempts
-            from apps.adw_server.core.handlers import make_github_issue_comment
-
             max_attempts_comment = (
                 f"⚠️ **Maximum Re-Implementation Attempts Reached**\n\n"
                 f"**Attempts:** {current_count}/{config.max_reimplement_attempts}\n\n"
@@ -462,16 +594,13 @@ async def handle_review_results(
                 f"- Close and re-open the issue to reset the counter if needed"
             )
 
-            for issue_num in issue_numbers:
-                try:
-                    make_github_issue_comment(
-                        issue_number=issue_num,
-                        comment=max_attempts_comment,
-                        repo_owner=repo_owner,
-                        repo_name=repo_name,
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to post max attempts comment to issue #{issue_num}: {e}")
+            await post_comment_to_issues(
+                issue_numbers,
+                max_attempts_comment,
+                repo_owner,
+                repo_name,
+                description="max attempts comment",
+            )
 
             return result
 
@@ -489,7 +618,7 @@ async def handle_review_results(
 
         if any(issues.values()):
             feedback_parts.append("## Issues Found\n")
-            for severity in ["Critical", "Moderate", "Minor"]:
+            for severity in _SEVERITY_NAMES.values():
                 if issues[severity]:
                     feedback_parts.append(f"### {severity}\n")
                     for issue in issues[severity]:
@@ -507,17 +636,32 @@ async def handle_review_results(
         new_adw_id = generate_short_id()
 
         try:
-            chore_result, impl_result = await trigger_reimplementation(
-                issue_number=primary_issue,
-                original_prompt=original_prompt,
-                review_feedback=review_feedback,
-                adw_id=new_adw_id,
-                model=model,
-                working_dir=working_dir,
-                repo_owner=repo_owner,
-                repo_name=repo_name,
-                issue_title=issue_title,
-                logger=logger,
+            # The "started" comment goes out while the workflow runs rather
+            # than after it finishes
+            (chore_result, impl_result), _ = await asyncio.gather(
+                trigger_reimplementation(
+                    issue_number=primary_issue,
+                    original_prompt=original_prompt,
+                    review_feedback=review_feedback,
+                    adw_id=new_adw_id,
+                    model=model,
+                    working_dir=working_dir,
+                    repo_owner=repo_owner,
+                    repo_name=repo_name,
+                    issue_title=issue_title,
+                    logger=logger,
+                ),
+                post_comment_to_issues(
+                    issue_numbers,
+                    format_reimplementation_comment(
+                        review_adw_id=review_result.adw_id,
+                        new_adw_id=new_adw_id,
+                        review_feedback=review_feedback[:500],  # Truncate if too long
+                    ),
+                    repo_owner,
+                    repo_name,
+                    description="re-implementation start comment",
+                ),
             )
 
             result["success"] = chore_result.success
@@ -526,19 +670,6 @@ async def handle_review_results(
             result["chore_result"] = chore_result
             result["impl_result"] = impl_result
 
-            # Post re-implementation comment
-            for issue_num in issue_numbers:
-                try:
-                    post_reimplementation_comment(
-                        issue_number=issue_num,
-                        repo_full_name=repo_full_name,
-                        review_adw_id=review_result.adw_id,
-                        new_adw_id=new_adw_id,
-                        review_feedback=review_feedback[:500],  # Truncate if too long
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to post reimplementation comment to issue #{issue_num}: {e}")
-
         except Exception as e:
             logger.error(f"Error triggering re-implementation: {e}", exc_info=True)
             result["success"] = False
@@ -556,20 +687,16 @@ async def handle_review_results(
     return result
 
 
-def post_merge_comment(
-    issue_number: int,
-    repo_full_name: str,
+def format_merge_comment(
     pr_number: int,
     pr_url: str,
     adw_id: str,
     merge_success: bool,
     error_message: Optional[str] = None
-) -> bool:
-    """Post a comment about merge success or failure.
+) -> str:
+    """Build the comment text reporting merge success or failure.
 
     Args:
-        issue_number: GitHub issue number
-        repo_full_name: Full repository name (owner/repo)
         pr_number: Pull request number
         pr_url: Pull request URL
         adw_id: ADW workflow ID
@@ -577,16 +704,8 @@ def post_merge_comment(
         error_message: Optional error message if merge failed
 
     Returns:
-        True if comment posted successfully, False otherwise
+        Markdown comment body
     """
-    from apps.adw_server.core.handlers import make_github_issue_comment
-
-    try:
-        repo_owner, repo_name = repo_full_name.split("/")
-    except ValueError:
-        logger.error(f"Invalid repo_full_name format: {repo_full_name}")
-        return False
-
     if merge_success:
         comment = (
             f"✅ **PR Merged Successfully**\n\n"
@@ -596,64 +715,38 @@ def post_merge_comment(
             f"Great work! 🎉"
         )
     else:
-        comment = (
+        comment_parts = [
             f"⚠️ **Automatic Merge Failed**\n\n"
             f"**PR:** [#{pr_number}]({pr_url})\n"
             f"**ADW ID:** `{adw_id}`\n\n"
             f"The pull request was approved but automatic merge failed.\n\n"
-        )
+        ]
         if error_message:
-            comment += f"**Error:**\n```\n{error_message}\n```\n\n"
+            comment_parts.append(f"**Error:**\n```\n{error_message}\n```\n\n")
 
-        comment += (
-            f"**Next Steps:**\n"
-            f"- Check for merge conflicts\n"
-            f"- Ensure all required checks have passed\n"
-            f"- Try merging manually or re-running the workflow"
+        comment_parts.append(
+            "**Next Steps:**\n"
+            "- Check for merge conflicts\n"
+            "- Ensure all required checks have passed\n"
+            "- Try merging manually or re-running the workflow"
         )
+        comment = "".join(comment_parts)
 
-    try:
-        make_github_issue_comment(
-            issue_number=issue_number,
-            comment=comment,
-            repo_owner=repo_owner,
-            repo_name=repo_name,
-        )
-        logger.info(f"Posted merge status comment to issue #{issue_number}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to post merge comment to issue #{issue_number}: {e}")
-        return False
+    return comment
 
 
-def post_reimplementation_comment(
-    issue_number: int,
-    repo_full_name: str,
-    review_adw_id: str,
-    new_adw_id: str,
-    review_feedback: str
-) -> bool:
-    """Post a comment about re-implementation being started.
+def format_reimplementation_comment(review_adw_id: str, new_adw_id: str, review_feedback: str) -> str:
+    """Build the comment text announcing a re-implementation.
 
     Args:
-        issue_number: GitHub issue number
-        repo_full_name: Full repository name (owner/repo)
         review_adw_id: Original review ADW ID
         new_adw_id: New re-implementation ADW ID
         review_feedback: Summary of review feedback
 
     Returns:
-        True if comment posted successfully, False otherwise
+        Markdown comment body
     """
-    from apps.adw_server.core.handlers import make_github_issue_comment
-
-    try:
-        repo_owner, repo_name = repo_full_name.split("/")
-    except ValueError:
-        logger.error(f"Invalid repo_full_name format: {repo_full_name}")
-        return False
-
-    comment = (
+    return (
         f"🔄 **Re-Implementation Started**\n\n"
         f"**Review ADW ID:** `{review_adw_id}`\n"
         f"**New ADW ID:** `{new_adw_id}`\n\n"
@@ -662,16 +755,3 @@ def post_reimplementation_comment(
         f"**Review Feedback:**\n{review_feedback}\n\n"
         f"Results will be posted when the re-implementation completes."
     )
-
-    try:
-        make_github_issue_comment(
-            issue_number=issue_number,
-            comment=comment,
-            repo_owner=repo_owner,
-            repo_name=repo_name,
-        )
-        logger.info(f"Posted re-implementation start comment to issue #{issue_number}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to post re-implementation comment to issue #{issue_number}: {e}")
-        return False
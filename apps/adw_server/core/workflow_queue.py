@@ -0,0 +1,127 @@
+"""Background queue for long-running webhook workflows.
+
+GitHub abandons a webhook delivery if the response takes longer than about
+10 seconds, while ADW workflows (planning, implementation, review) run for
+minutes. When background workflows are enabled the server puts each parsed
+event on this queue, answers the webhook with 202 Accepted, and a worker task
+started from the FastAPI lifespan runs the handler afterwards. The handlers
+already post their progress and results as GitHub comments, so nothing is lost
+by not returning the result in the HTTP response.
+
+Example:
+    worker = start_workflow_worker()
+    await enqueue_workflow(
+        handle_issue_event,
+        description="issue #123",
+        payload=issue_payload,
+        working_dir=config.adw_working_dir,
+    )
+    ...
+    await stop_workflow_worker(worker)
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+# Configure logger
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkItem:
+    """A webhook handler call waiting to run on the workflow worker."""
+    handler: Callable[..., Awaitable[dict]]
+    description: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+# Created by start_workflow_worker so it belongs to the server's event loop
+_workflow_queue: Optional[asyncio.Queue] = None
+
+
+async def enqueue_workflow(
+    handler: Callable[..., Awaitable[dict]],
+    description: str,
+    **kwargs: Any,
+) -> int:
+    """Queue a handler call for the background worker.
+
+    Args:
+        handler: Async webhook handler (e.g. handle_issue_event)
+        description: Short label used in log messages (e.g. "issue #123")
+        **kwargs: Keyword arguments passed to the handler
+
+    Returns:
+        Number of work items waiting in the queue after this one was added
+
+    Raises:
+        RuntimeError: If the worker has not been started
+    """
+    if _workflow_queue is None:
+        raise RuntimeError("Background workflow worker is not running")
+
+    await _workflow_queue.put(WorkItem(handler=handler, description=description, kwargs=kwargs))
+    queued = _workflow_queue.qsize()
+    logger.info(f"Queued workflow for {description} ({queued} pending)")
+    return queued
+
+
+async def run_workflow_worker(queue: asyncio.Queue) -> None:
+    """Run queued handler calls one at a time until cancelled.
+
+    Exceptions raised by a handler are logged and do not stop the worker.
+
+    Args:
+        queue: Queue of WorkItem objects to drain
+    """
+    while True:
+        item = await queue.get()
+        try:
+            logger.info(f"Running queued workflow for {item.description}")
+            result = await item.handler(**item.kwargs)
+            logger.info(
+                f"Queued workflow for {item.description} finished: "
+                f"workflow_triggered={result.get('workflow_triggered')}, adw_id={result.get('adw_id')}"
+            )
+        except Exception as e:
+            logger.error(f"Queued workflow for {item.description} failed: {e}", exc_info=True)
+        finally:
+            queue.task_done()
+
+
+def start_workflow_worker() -> asyncio.Task:
+    """Start the background worker on the running event loop.
+
+    Returns:
+        The worker task, to be passed to stop_workflow_worker on shutdown
+    """
+    global _workflow_queue
+    _workflow_queue = asyncio.Queue()
+    logger.info("Starting background workflow worker")
+    return asyncio.create_task(run_workflow_worker(_workflow_queue), name="adw-workflow-worker")
+
+
+async def stop_workflow_worker(worker: asyncio.Task) -> None:
+    """Cancel the background worker and wait for it to exit.
+
+    Args:
+        worker: Task returned by start_workflow_worker
+    """
+    global _workflow_queue
+    pending = _workflow_queue.qsize() if _workflow_queue is not None else 0
+    if pending:
+        logger.warning(f"Stopping workflow worker with {pending} queued workflow(s) not started")
+    _workflow_queue = None
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+
+async def wait_for_queued_workflows() -> None:
+    """Wait until every queued workflow has finished running."""
+    if _workflow_queue is not None:
+        await _workflow_queue.join()
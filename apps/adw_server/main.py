@@ -25,6 +25,31 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def select_server_backends() -> tuple[str, str]:
+    """Pick uvicorn's event loop and HTTP parser.
+
+    Prefers uvloop and httptools (both installed by uvicorn[standard]) and
+    falls back to the pure-Python asyncio loop and h11 parser, e.g. on
+    Windows where uvloop is unavailable.
+
+    Returns:
+        Tuple of (loop, http) values for uvicorn.run
+    """
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    return loop, http
+
+
 def main():
     """Start the ADW automation server."""
     import uvicorn
@@ -36,10 +61,15 @@ def main():
         logger.info(f"Environment: {config.environment}")
         logger.info(f"Working directory: {config.adw_working_dir}")
 
+        loop, http = select_server_backends()
+        logger.info(f"Event loop: {loop}, HTTP parser: {http}")
+
         uvicorn.run(
             "apps.adw_server.server:app",
             host=config.server_host,
             port=config.server_port,
+            loop=loop,
+            http=http,
             log_level=config.log_level.lower(),
             reload=not config.is_production(),
         )
@@ -34,12 +34,14 @@ Endpoints:
     GET  /app or /app/          - Camera app (served from static files)
 """
 
+import hmac
 import logging
 import sys
 import os
 from contextlib import asynccontextmanager
 from typing import Optional
 
+import orjson
 from fastapi import FastAPI, Request, Response, HTTPException, status
 from fastapi.responses import JSONResponse, RedirectResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
@@ -55,12 +57,23 @@ if adw_server_dir not in sys.path:
 
 from core.config import get_config
 from core.handlers import (
-    validate_webhook_signature,
+    new_webhook_hmac,
+    verify_webhook_hmac,
+    get_hmac_backend,
     handle_issue_event,
     handle_pull_request_event,
     IssueWebhookPayload,
     PullRequestWebhookPayload,
+    REVIEW_TRIGGER_ACTIONS,
 )
+from core.workflow_queue import (
+    enqueue_workflow,
+    start_workflow_worker,
+    stop_workflow_worker,
+)
+# Imported under the package path used by review_actions, so shutdown closes
+# the same client instance the merge calls use
+from apps.adw_server.core.http_client import close_github_client
 
 
 # Configure logging
@@ -81,10 +94,13 @@ async def lifespan(app: FastAPI):
     Startup:
         - Load and validate configuration
         - Set up logging
+        - Log the SHA-256 backend used for webhook signatures
         - Verify ADW modules are accessible
+        - Start the background workflow worker (if enabled)
 
     Shutdown:
-        - Clean up resources (if needed)
+        - Stop the background workflow worker (if running)
+        - Close the shared GitHub API client
     """
     # Startup
     logger = logging.getLogger("webhook_server")
@@ -97,6 +113,13 @@ async def lifespan(app: FastAPI):
         logger.info(f"Static files: {config.static_files_dir}")
         logger.info(f"Environment: {config.environment}")
 
+        # Report the SHA-256 backend used for webhook signature checks
+        hmac_backend, uses_openssl = get_hmac_backend()
+        if uses_openssl:
+            logger.info(f"Webhook HMAC backend: {hmac_backend}")
+        else:
+            logger.warning(f"Webhook HMAC backend: {hmac_backend} - signature checks will be slow")
+
         # Verify ADW modules are accessible
         try:
             from core.adw_integration import generate_adw_id
@@ -110,10 +133,15 @@ async def lifespan(app: FastAPI):
         logger.error(f"Startup failed: {e}")
         raise
 
+    worker = start_workflow_worker() if config.adw_background_workflows else None
+
     yield
 
     # Shutdown
     logger.info("Shutting down FastAPI webhook server...")
+    if worker is not None:
+        await stop_workflow_worker(worker)
+    close_github_client()
 
 
 # Create FastAPI application
@@ -130,7 +158,9 @@ setup_logging(config.log_level)
 logger = logging.getLogger("webhook_server")
 
 
-# Add CORS middleware if enabled
+# Add CORS middleware if enabled. CORSMiddleware builds its preflight headers
+# once at startup and answers OPTIONS preflights without routing; max_age lets
+# browsers reuse a preflight for 2 hours (Chromium's cap) instead of 10 minutes
 if config.cors_enabled:
     app.add_middleware(
         CORSMiddleware,
@@ -138,6 +168,7 @@ if config.cors_enabled:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        max_age=7200,
     )
     logger.info(f"CORS enabled with origins: {config.cors_origins}")
 
@@ -222,6 +253,102 @@ async def readiness_check():
         )
 
 
+async def read_webhook_body(request: Request, max_bytes: int, mac: Optional[hmac.HMAC] = None) -> bytes:
+    """Read the request body, rejecting it as soon as it exceeds max_bytes.
+
+    A Content-Length over the limit is refused before anything is read;
+    otherwise the body is streamed and the read stops at the first chunk
+    that crosses the limit, so an oversized delivery is never fully buffered.
+    When mac is given, each chunk is fed to it as it arrives, so the
+    signature is computed while the body is still being received.
+
+    Args:
+        request: FastAPI Request object
+        max_bytes: Largest body size accepted
+        mac: Optional HMAC (from new_webhook_hmac) to update with the body
+
+    Returns:
+        Raw request body
+
+    Raises:
+        HTTPException: 413 if the body is larger than max_bytes
+    """
+    too_large = HTTPException(
+        # Literal code: the status constant was renamed between Starlette releases
+        status_code=413,
+        detail=f"Webhook payload exceeds {max_bytes} bytes"
+    )
+
+    content_length = request.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+
+    chunks = []
+    total = 0
+    async for chunk in request.stream():
+        total += len(chunk)
+        if total > max_bytes:
+            raise too_large
+        if mac is not None:
+            mac.update(chunk)
+        chunks.append(chunk)
+
+    return b"".join(chunks)
+
+
+# Webhook events with a handler; anything else is ignored before parsing
+SUPPORTED_EVENT_TYPES = frozenset({"issues", "pull_request"})
+
+
+def webhook_response(content: dict, status_code: int = status.HTTP_200_OK) -> Response:
+    """Build a JSON response serialized with orjson.
+
+    Args:
+        content: JSON-serializable response body
+        status_code: HTTP status code
+
+    Returns:
+        Response with an application/json body
+    """
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
+def parse_issue_payload(body: bytes) -> IssueWebhookPayload:
+    """Validate an issues webhook body straight from its raw bytes.
+
+    pydantic-core parses the JSON in Rust and only creates Python objects for
+    the fields IssueWebhookPayload declares, so the rest of the payload
+    (often tens of kilobytes) is never turned into nested dicts first.
+
+    Args:
+        body: Raw request body
+
+    Returns:
+        Validated issue payload
+
+    Raises:
+        HTTPException: 400 if the body is not JSON or not an issue payload
+    """
+    try:
+        return IssueWebhookPayload.model_validate_json(body)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            logger.error(f"Failed to parse webhook payload: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
+            )
+        logger.error(f"Failed to parse issue payload: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid issue payload: {e}"
+        )
+
+
 # Shared webhook processing logic
 async def process_github_webhook(request: Request):
     """Process GitHub webhook events.
@@ -234,11 +361,13 @@ async def process_github_webhook(request: Request):
         request: FastAPI Request object containing webhook payload
 
     Returns:
-        JSONResponse with processing status
+        JSON response with processing status, or 202 Accepted when the event
+        was queued for the background workflow worker
 
     Raises:
         HTTPException: 401 if signature is invalid
         HTTPException: 400 if payload is invalid
+        HTTPException: 413 if payload is larger than webhook_max_body_bytes
         HTTPException: 500 if processing fails
     """
     # Get event type from header
@@ -250,16 +379,13 @@ async def process_github_webhook(request: Request):
             detail="Missing X-GitHub-Event header"
         )
 
-    # Read raw body for signature validation
-    body = await request.body()
+    # Read raw body, refusing oversized deliveries and hashing it as it arrives
+    mac = new_webhook_hmac(config.gh_wb_secret)
+    body = await read_webhook_body(request, config.webhook_max_body_bytes, mac=mac)
 
     # Validate webhook signature
     signature = request.headers.get("X-Hub-Signature-256")
-    is_valid = validate_webhook_signature(
-        payload_body=body,
-        signature_header=signature,
-        secret=config.gh_wb_secret,
-    )
+    is_valid = verify_webhook_hmac(mac, signature)
 
     if not is_valid:
         logger.warning(f"Invalid webhook signature for event: {event_type}")
@@ -268,31 +394,58 @@ async def process_github_webhook(request: Request):
             detail="Invalid webhook signature"
         )
 
-    # Parse JSON payload
-    try:
-        payload = await request.json()
-    except Exception as e:
-        logger.error(f"Failed to parse webhook payload: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON payload"
+    # Other events (pushes, comments, pings, ...) are acknowledged without
+    # parsing the payload at all
+    if event_type not in SUPPORTED_EVENT_TYPES:
+        logger.info(f"Ignoring unsupported event type: {event_type}")
+        return webhook_response(
+            content={
+                "status": "ignored",
+                "reason": f"Event type not supported: {event_type}",
+                "event_type": event_type,
+            }
         )
 
+    # Parse the body already read for signature validation. Issue payloads are
+    # validated from the bytes directly; PR events need the full dict, parsed
+    # with orjson (several times faster than the stdlib parser)
+    if event_type == "issues":
+        issue_payload = parse_issue_payload(body)
+        action, repo_full_name = issue_payload.action, issue_payload.repository.full_name
+    else:
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse webhook payload: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
+            )
+        action, repo_full_name = payload.get("action"), payload.get("repository", {}).get("full_name")
+
     logger.info(f"Received valid GitHub webhook: event={event_type}")
-    logger.info(f"Webhook payload preview: action={payload.get('action')}, repo={payload.get('repository', {}).get('full_name')}")
+    logger.info(f"Webhook payload preview: action={action}, repo={repo_full_name}")
 
     # Route event to appropriate handler
     try:
         if event_type == "issues":
-            # Parse and handle issue event
-            try:
-                issue_payload = IssueWebhookPayload(**payload)
-                logger.info(f"✓ Parsed issue webhook: issue=#{issue_payload.issue.number}, action={issue_payload.action}, labels={[l.name for l in issue_payload.issue.labels]}")
-            except ValidationError as e:
-                logger.error(f"Failed to parse issue payload: {e}")
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Invalid issue payload: {e}"
+            logger.info(f"✓ Parsed issue webhook: issue=#{issue_payload.issue.number}, action={issue_payload.action}, labels={[l.name for l in issue_payload.issue.labels]}")
+
+            if config.adw_background_workflows:
+                await enqueue_workflow(
+                    handle_issue_event,
+                    description=f"issue #{issue_payload.issue.number}",
+                    payload=issue_payload,
+                    working_dir=config.adw_working_dir,
+                    model=config.adw_default_model,
+                )
+                return webhook_response(
+                    status_code=status.HTTP_202_ACCEPTED,
+                    content={
+                        "status": "queued",
+                        "event_type": event_type,
+                        "issue_number": issue_payload.issue.number,
+                    }
                 )
 
             logger.info(f"→ Calling handle_issue_event for issue #{issue_payload.issue.number}")
@@ -303,9 +456,22 @@ async def process_github_webhook(request: Request):
             )
             logger.info(f"✓ handle_issue_event completed: workflow_triggered={result.get('workflow_triggered')}, adw_id={result.get('adw_id')}")
 
-            return JSONResponse(content=result)
+            return webhook_response(content=result)
 
         elif event_type == "pull_request":
+            # Most PR deliveries (closed, edited, labeled, ...) never start a
+            # review; answer them before validating the full PR object
+            if action not in REVIEW_TRIGGER_ACTIONS:
+                logger.info(f"Skipping PR review for action: {action}")
+                return webhook_response(
+                    content={
+                        "workflow_triggered": False,
+                        "reason": f"PR action '{action}' does not trigger review workflow",
+                        "pr_number": payload.get("number"),
+                        "action": action,
+                    }
+                )
+
             # Parse and handle pull request event
             try:
                 pr_payload = PullRequestWebhookPayload(**payload)
@@ -317,6 +483,23 @@ async def process_github_webhook(request: Request):
                     detail=f"Invalid PR payload: {e}"
                 )
 
+            if config.adw_background_workflows:
+                await enqueue_workflow(
+                    handle_pull_request_event,
+                    description=f"PR #{pr_payload.number}",
+                    payload=pr_payload,
+                    working_dir=config.adw_working_dir,
+                    model=config.adw_default_model,
+                )
+                return webhook_response(
+                    status_code=status.HTTP_202_ACCEPTED,
+                    content={
+                        "status": "queued",
+                        "event_type": event_type,
+                        "pr_number": pr_payload.number,
+                    }
+                )
+
             logger.info(f"→ Calling handle_pull_request_event for PR #{pr_payload.number}")
             result = await handle_pull_request_event(
                 payload=pr_payload,
@@ -325,18 +508,7 @@ async def process_github_webhook(request: Request):
             )
             logger.info(f"✓ handle_pull_request_event completed: workflow_triggered={result.get('workflow_triggered')}, adw_id={result.get('adw_id')}")
 
-            return JSONResponse(content=result)
-
-        else:
-            # Unsupported event type
-            logger.info(f"Ignoring unsupported event type: {event_type}")
-            return JSONResponse(
-                content={
-                    "status": "ignored",
-                    "reason": f"Event type not supported: {event_type}",
-                    "event_type": event_type,
-                }
-            )
+            return webhook_response(content=result)
 
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -9,11 +9,15 @@ Fixtures include:
 - Test repository setup utilities
 """
 
+import asyncio
+import hashlib
+import hmac
 import os
 import sys
 import tempfile
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Generator
 from unittest.mock import Mock, MagicMock
@@ -25,6 +29,15 @@ from httpx import AsyncClient, ASGITransport
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Make the server's ``core`` package importable the way server.py imports it.
+# Done once here rather than at the top of each test module.
+adw_server_dir = str(project_root / "apps" / "adw_server")
+if adw_server_dir not in sys.path:
+    sys.path.insert(0, adw_server_dir)
+
+# Webhook secret shared by mock_config, test_env_vars and signed payloads
+TEST_WEBHOOK_SECRET = "test_secret_1234567890"
+
 
 # ============================================================================
 # Pytest Configuration
@@ -41,6 +54,16 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "slow: mark test as slow running")
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run async tests on uvloop when installed, matching the server."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
+
 # ============================================================================
 # Temporary Directory Fixtures
 # ============================================================================
@@ -50,8 +73,7 @@ def temp_dir() -> Generator[str, None, None]:
     """Provide a temporary directory that's cleaned up after the test."""
     temp_path = tempfile.mkdtemp()
     yield temp_path
-    if os.path.exists(temp_path):
-        shutil.rmtree(temp_path)
+    shutil.rmtree(temp_path, ignore_errors=True)
 
 
 @pytest.fixture
@@ -143,10 +165,8 @@ def temp_repo_with_remote(temp_dir: str) -> Generator[tuple[str, str], None, Non
     yield local_dir, remote_dir
 
     # Cleanup
-    if os.path.exists(local_dir):
-        shutil.rmtree(local_dir)
-    if os.path.exists(remote_dir):
-        shutil.rmtree(remote_dir)
+    shutil.rmtree(local_dir, ignore_errors=True)
+    shutil.rmtree(remote_dir, ignore_errors=True)
 
 
 # ============================================================================
@@ -165,7 +185,7 @@ def mock_config(temp_dir: str):
     config = ServerConfig(
         server_host="127.0.0.1",
         server_port=8000,
-        gh_wb_secret="test_secret_1234567890",
+        gh_wb_secret=TEST_WEBHOOK_SECRET,
         adw_working_dir=temp_dir,
         static_files_dir=static_dir,
         cors_enabled=True,
@@ -183,7 +203,7 @@ def test_env_vars(temp_dir: str, monkeypatch):
     os.makedirs(static_dir, exist_ok=True)
 
     env_vars = {
-        "GH_WB_SECRET": "test_secret_1234567890",
+        "GH_WB_SECRET": TEST_WEBHOOK_SECRET,
         "SERVER_HOST": "127.0.0.1",
         "SERVER_PORT": "8000",
         "ADW_WORKING_DIR": temp_dir,
@@ -219,7 +239,17 @@ async def test_app(mock_config, monkeypatch):
 
 @pytest.fixture
 async def async_client(test_app) -> AsyncClient:
-    """Provide an async HTTP client for testing FastAPI endpoints."""
+    """Provide an async HTTP client for testing FastAPI endpoints.
+
+    Kept function-scoped on purpose. ASGITransport calls the app in-process,
+    so there are no sockets or TLS to reuse, and the app module is imported
+    once per run regardless. A shared client would also outlive the per-test
+    config monkeypatching in test_app and tie every test to one event loop.
+
+    Endpoint tests stay async even when nothing else awaits: httpx's sync
+    Client can't drive ASGITransport, and Starlette's TestClient runs each
+    request through a portal thread, which is roughly twice as slow.
+    """
     transport = ASGITransport(app=test_app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
@@ -229,9 +259,8 @@ async def async_client(test_app) -> AsyncClient:
 # Mock GitHub API Fixtures
 # ============================================================================
 
-@pytest.fixture
-def mock_github_issue_payload():
-    """Provide a mock GitHub issue webhook payload."""
+def build_issue_payload() -> dict:
+    """Build a mock GitHub issue webhook payload."""
     return {
         "action": "opened",
         "issue": {
@@ -252,15 +281,39 @@ def mock_github_issue_payload():
         "repository": {
             "name": "testrepo",
             "full_name": "testuser/testrepo",
+            "html_url": "https://github.com/testuser/testrepo",
             "owner": {
                 "login": "testuser",
                 "id": 12345,
                 "type": "User"
             }
+        },
+        "sender": {
+            "login": "testuser",
+            "id": 12345,
+            "type": "User"
         }
     }
 
 
+@pytest.fixture
+def mock_github_issue_payload():
+    """Provide a mock GitHub issue webhook payload."""
+    return build_issue_payload()
+
+
+@pytest.fixture(scope="module")
+def signed_issue_payload():
+    """Provide the mock issue payload as request bytes and their signature.
+
+    Serialized and signed once per test module, since the bytes never change.
+    """
+    import orjson
+
+    payload = orjson.dumps(build_issue_payload())
+    return payload, generate_github_signature(payload, TEST_WEBHOOK_SECRET)
+
+
 @pytest.fixture
 def mock_github_pr_payload():
     """Provide a mock GitHub pull request webhook payload."""
@@ -313,10 +366,81 @@ def mock_subprocess_run(mocker):
     return mock
 
 
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Replace subprocess.run with a lightweight recording fake.
+
+    Each call is stored in ``fake_run.calls`` as an ``(args, kwargs)`` tuple.
+    ``fake_run.set_rc(code)`` changes the returned exit code,
+    ``fake_run.set_stdout(text)`` the returned stdout, and
+    ``fake_run.set_error(exc)`` makes subsequent calls raise ``exc``.
+    """
+    calls = []
+    state = {"returncode": 0, "stdout": "", "error": None}
+
+    def _run(*args, **kwargs):
+        calls.append((args, kwargs))
+        if state["error"] is not None:
+            raise state["error"]
+        return subprocess.CompletedProcess(args[0], state["returncode"], state["stdout"], "")
+
+    _run.calls = calls
+    _run.set_rc = lambda code: state.update(returncode=code)
+    _run.set_stdout = lambda text: state.update(stdout=text)
+    _run.set_error = lambda exc: state.update(error=exc)
+
+    monkeypatch.setattr(subprocess, "run", _run)
+    return _run
+
+
+@pytest.fixture
+def dedup_cache(monkeypatch):
+    """Give the test its own empty workflow deduplication cache.
+
+    The cache is swapped in for the module global, so tests never see
+    triggers recorded by other tests and need no manual clearing. Both
+    import paths of the handlers module are patched when loaded.
+    """
+    from cachetools import TTLCache
+    from apps.adw_server.core import handlers
+
+    cache = TTLCache(maxsize=handlers.DEDUP_CACHE_MAXSIZE, ttl=handlers.DEDUP_WINDOW_SECONDS)
+    monkeypatch.setattr(handlers, "_workflow_dedup_cache", cache)
+    if "core.handlers" in sys.modules:
+        monkeypatch.setattr(sys.modules["core.handlers"], "_workflow_dedup_cache", cache)
+    return cache
+
+
 # ============================================================================
 # Utility Functions
 # ============================================================================
 
+@lru_cache(maxsize=4)
+def _signing_hmac(secret: str) -> hmac.HMAC:
+    """Return an HMAC-SHA256 keyed with the secret, to be copied per payload.
+
+    Copying this and feeding the payload in one update is as fast as the
+    single-shot hmac.digest on large bodies, and faster on small ones, since
+    the key is not re-padded each time. Both hash through OpenSSL.
+    """
+    return hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def generate_github_signature_bytes(payload: bytes, secret: str) -> bytes:
+    """Generate the raw HMAC-SHA256 digest GitHub signs a webhook body with.
+
+    Args:
+        payload: Request body bytes
+        secret: Webhook secret
+
+    Returns:
+        32-byte digest
+    """
+    mac = _signing_hmac(secret).copy()
+    mac.update(payload)
+    return mac.digest()
+
+
 def generate_github_signature(payload: bytes, secret: str) -> str:
     """Generate a valid GitHub webhook signature for testing.
 
@@ -327,15 +451,21 @@ def generate_github_signature(payload: bytes, secret: str) -> str:
     Returns:
         GitHub signature in format "sha256=<hex_digest>"
     """
-    import hmac
-    import hashlib
-
-    signature = hmac.new(
-        secret.encode("utf-8"),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
-    return f"sha256={signature}"
+    return f"sha256={generate_github_signature_bytes(payload, secret).hex()}"
+
+
+def response_json(response) -> dict:
+    """Decode a test client response body with orjson, as the server encodes it.
+
+    Args:
+        response: httpx response returned by the test client
+
+    Returns:
+        Decoded JSON body
+    """
+    import orjson
+
+    return orjson.loads(response.content)
 
 
 # Export utility function for use in tests
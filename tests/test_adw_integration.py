@@ -6,11 +6,13 @@ Tests cover:
 - Implement workflow triggering
 - Chore+implement workflow orchestration
 - WorkflowResult parsing
+- Async git helper
 - Error handling
 """
 
 import pytest
 import os
+from dataclasses import FrozenInstanceError, replace
 from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from apps.adw_server.core.adw_integration import (
     generate_adw_id,
@@ -19,6 +21,7 @@ from apps.adw_server.core.adw_integration import (
     trigger_chore_implement_workflow,
     generate_pr_body,
     WorkflowResult,
+    _run_git,
 )
 from adws.adw_modules.agent import AgentPromptResponse
 
@@ -368,6 +371,36 @@ def test_workflow_result_failure():
     assert result.plan_path is None
 
 
+def test_workflow_result_ok():
+    """Test WorkflowResult.ok builds a successful result without an error."""
+    result = WorkflowResult.ok("Done", "session-12345", "abc12345", plan_path="specs/plan.md")
+
+    assert result.success is True
+    assert result.output == "Done"
+    assert result.session_id == "session-12345"
+    assert result.adw_id == "abc12345"
+    assert result.plan_path == "specs/plan.md"
+    assert result.error_message is None
+    assert not hasattr(result, "__dict__")
+
+
+def test_workflow_result_is_immutable():
+    """Test WorkflowResult rejects mutation and derives changes via replace."""
+    result = WorkflowResult(
+        success=True,
+        output="Done",
+        adw_id="abc12345",
+        output_dir="agents/abc12345/planner",
+    )
+
+    with pytest.raises(FrozenInstanceError):
+        result.success = False
+
+    failed = replace(result, success=False)
+    assert failed.success is False
+    assert result.success is True
+
+
 # ============================================================================
 # PR Body Generation Tests
 # ============================================================================
@@ -454,3 +487,28 @@ def test_generate_pr_body_handles_missing_plan(temp_dir):
     assert "Closes #42" in pr_body
     assert "Add feature X" in pr_body
     assert "ADW ID" in pr_body
+
+
+# ============================================================================
+# Async Git Helper Tests
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_run_git_returns_decoded_output(temp_dir):
+    """Test _run_git runs git without blocking and decodes its output."""
+    await _run_git(["git", "init"], cwd=temp_dir)
+
+    result = await _run_git(["git", "rev-parse", "--is-inside-work-tree"], cwd=temp_dir)
+
+    assert result.returncode == 0
+    assert result.stdout.strip() == "true"
+    assert result.args == ["git", "rev-parse", "--is-inside-work-tree"]
+
+
+@pytest.mark.asyncio
+async def test_run_git_reports_failure(temp_dir):
+    """Test _run_git surfaces a non-zero exit code and stderr."""
+    result = await _run_git(["git", "checkout", "does-not-exist"], cwd=temp_dir)
+
+    assert result.returncode != 0
+    assert result.stderr
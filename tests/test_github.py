@@ -6,131 +6,119 @@ Tests cover:
 - API error handling
 """
 
+import json
+import subprocess
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import patch
+
+from apps.adw_server.core.handlers import (
+    make_github_issue_comment,
+    make_github_issue_comments_batch,
+    update_github_issue_comments_batch,
+    resolve_issue_node_ids,
+    check_github_available,
+    get_gh_env,
+    _issue_node_id_cache,
+    ADW_BOT_IDENTIFIER,
+)
 
 
 # ============================================================================
 # GitHub Comment Tests
 # ============================================================================
 
-def test_make_github_comment_success():
+def test_make_github_comment_success(fake_run):
     """Test successful GitHub comment posting."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
-
-        from apps.adw_server.core.handlers import make_github_issue_comment
 
-        result = make_github_issue_comment(
-            issue_number=123,
-            comment="Test comment",
-            repo_owner="testowner",
-            repo_name="testrepo"
-        )
+    result = make_github_issue_comment(
+        issue_number=123,
+        comment="Test comment",
+        repo_owner="testowner",
+        repo_name="testrepo"
+    )
 
-        assert result is True
-        mock_run.assert_called_once()
+    assert result is True
+    assert len(fake_run.calls) == 1
 
-        # Verify gh CLI was called with correct arguments
-        call_args = mock_run.call_args[0][0]
-        assert "gh" in call_args
-        assert "issue" in call_args
-        assert "comment" in call_args
-        assert "123" in call_args
+    # Verify gh CLI was called with correct arguments
+    args, _ = fake_run.calls[0]
+    call_args = args[0]
+    assert "gh" in call_args
+    assert "issue" in call_args
+    assert "comment" in call_args
+    assert "123" in call_args
 
 
-def test_make_github_comment_failure():
+def test_make_github_comment_failure(fake_run):
     """Test failed GitHub comment posting."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = Mock(returncode=1, stdout="", stderr="Error")
+    fake_run.set_rc(1)
 
-        from apps.adw_server.core.handlers import make_github_issue_comment
+    result = make_github_issue_comment(
+        issue_number=123,
+        comment="Test comment",
+        repo_owner="testowner",
+        repo_name="testrepo"
+    )
 
-        result = make_github_issue_comment(
-            issue_number=123,
-            comment="Test comment",
-            repo_owner="testowner",
-            repo_name="testrepo"
-        )
+    assert result is False
 
-        assert result is False
 
-
-def test_make_github_comment_exception():
+def test_make_github_comment_exception(fake_run):
     """Test GitHub comment posting handles exceptions."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.side_effect = Exception("Command failed")
+    fake_run.set_error(Exception("Command failed"))
 
-        from apps.adw_server.core.handlers import make_github_issue_comment
+    result = make_github_issue_comment(
+        issue_number=123,
+        comment="Test comment",
+        repo_owner="testowner",
+        repo_name="testrepo"
+    )
 
-        result = make_github_issue_comment(
-            issue_number=123,
-            comment="Test comment",
-            repo_owner="testowner",
-            repo_name="testrepo"
-        )
-
-        assert result is False
+    assert result is False
 
 
-def test_make_github_comment_timeout():
+def test_make_github_comment_timeout(fake_run):
     """Test GitHub comment posting handles timeout."""
-    with patch("subprocess.run") as mock_run:
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("gh", 30)
+    fake_run.set_error(subprocess.TimeoutExpired("gh", 30))
 
-        from apps.adw_server.core.handlers import make_github_issue_comment
-
-        result = make_github_issue_comment(
-            issue_number=123,
-            comment="Test comment",
-            repo_owner="testowner",
-            repo_name="testrepo"
-        )
+    result = make_github_issue_comment(
+        issue_number=123,
+        comment="Test comment",
+        repo_owner="testowner",
+        repo_name="testrepo"
+    )
 
-        assert result is False
+    assert result is False
 
 
 # ============================================================================
 # GitHub CLI Availability Tests
 # ============================================================================
 
-def test_check_github_available_with_gh_and_token():
+def test_check_github_available_with_gh_and_token(fake_run, monkeypatch):
     """Test GitHub availability check when gh CLI and token are present."""
-    with patch("subprocess.run") as mock_run, \
-         patch.dict("os.environ", {"GITHUB_PAT": "test-token"}):
-
-        mock_run.return_value = Mock(returncode=0)
+    monkeypatch.setenv("GITHUB_PAT", "test-token")
 
-        from apps.adw_server.core.handlers import check_github_available
-
-        result = check_github_available()
-        assert result is True
+    result = check_github_available()
+    assert result is True
 
 
-def test_check_github_available_without_gh():
+def test_check_github_available_without_gh(fake_run):
     """Test GitHub availability check when gh CLI is not installed."""
-    with patch("subprocess.run") as mock_run:
-        import subprocess
-        mock_run.side_effect = FileNotFoundError()
+    fake_run.set_error(FileNotFoundError())
 
-        from apps.adw_server.core.handlers import check_github_available
-
-        result = check_github_available()
-        assert result is False
+    result = check_github_available()
+    assert result is False
 
 
-def test_check_github_available_without_token():
+def test_check_github_available_without_token(fake_run, monkeypatch):
     """Test GitHub availability check when token is missing."""
-    with patch("subprocess.run") as mock_run, \
-         patch.dict("os.environ", {}, clear=True):
-
-        mock_run.return_value = Mock(returncode=0)
+    for name in ("GITHUB_PAT", "GH_TOKEN", "GITHUB_TOKEN"):
+        monkeypatch.delenv(name, raising=False)
 
-        from apps.adw_server.core.handlers import check_github_available
-
-        result = check_github_available()
-        assert result is False
+    result = check_github_available()
+    assert result is False
 
 
 # ============================================================================
@@ -190,24 +178,116 @@ def test_post_workflow_comment_invalid_repo_name():
 # Comment Formatting Tests
 # ============================================================================
 
-def test_comment_includes_bot_identifier():
+def test_comment_includes_bot_identifier(fake_run):
     """Test that comments include the ADW bot identifier."""
-    with patch("subprocess.run") as mock_run:
-        mock_run.return_value = Mock(returncode=0)
 
-        from apps.adw_server.core.handlers import make_github_issue_comment, ADW_BOT_IDENTIFIER
+    make_github_issue_comment(
+        issue_number=123,
+        comment="Test comment",
+        repo_owner="owner",
+        repo_name="repo"
+    )
+
+    # Verify the comment includes the bot identifier
+    args, _ = fake_run.calls[0]
+    call_args = args[0]
+    body_index = call_args.index("--body") + 1
+    full_comment = call_args[body_index]
+
+    assert ADW_BOT_IDENTIFIER in full_comment
+    assert "Test comment" in full_comment
 
-        make_github_issue_comment(
-            issue_number=123,
-            comment="Test comment",
-            repo_owner="owner",
-            repo_name="repo"
-        )
 
-        # Verify the comment includes the bot identifier
-        call_args = mock_run.call_args[0][0]
-        body_index = call_args.index("--body") + 1
-        full_comment = call_args[body_index]
+# ============================================================================
+# gh Environment Tests
+# ============================================================================
+
+def test_gh_env_maps_token(fake_run, monkeypatch):
+    """Test each comment gets its own gh environment with the token mapped."""
+    monkeypatch.setenv("GITHUB_PAT", "test-token")
+
+    make_github_issue_comment(1, "First", "owner", "repo")
+    make_github_issue_comment(2, "Second", "owner", "repo")
+
+    first_env = fake_run.calls[0][1]["env"]
+    second_env = fake_run.calls[1][1]["env"]
+    assert first_env is not second_env
+    assert first_env["GH_TOKEN"] == "test-token"
+
+
+def test_gh_env_follows_environment_changes(monkeypatch):
+    """Test changed variables are picked up on the next call."""
+    monkeypatch.setenv("GITHUB_PAT", "old-token")
+    assert get_gh_env()["GH_TOKEN"] == "old-token"
+
+    monkeypatch.setenv("GITHUB_PAT", "new-token")
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    env = get_gh_env()
+    assert env["GH_TOKEN"] == "new-token"
+    assert env["HTTPS_PROXY"] == "http://proxy.example:3128"
+
+
+# ============================================================================
+# Batched Comment Tests
+# ============================================================================
 
-        assert ADW_BOT_IDENTIFIER in full_comment
-        assert "Test comment" in full_comment
+def test_resolve_issue_node_ids_queries_once(fake_run):
+    """Test node IDs are fetched in one query and then served from cache."""
+    _issue_node_id_cache.clear()
+    fake_run.set_stdout(json.dumps({
+        "data": {"repository": {"i123": {"id": "I_abc"}, "i456": {"id": "I_def"}}}
+    }))
+
+    first = resolve_issue_node_ids([123, 456], "owner", "repo")
+    second = resolve_issue_node_ids([123, 456], "owner", "repo")
+
+    assert first == second == {123: "I_abc", 456: "I_def"}
+    assert len(fake_run.calls) == 1
+    cmd = fake_run.calls[0][0][0]
+    assert cmd[:3] == ["gh", "api", "graphql"]
+
+
+def test_comments_batch_sends_one_mutation(fake_run):
+    """Test several issues are commented on with a single aliased mutation."""
+    _issue_node_id_cache.clear()
+    _issue_node_id_cache[("owner", "repo", 123)] = "I_abc"
+    _issue_node_id_cache[("owner", "repo", 456)] = "I_def"
+    fake_run.set_stdout(json.dumps({
+        "data": {"c0": {"commentEdge": {"node": {"id": "IC_1"}}}, "c1": None},
+        "errors": [{"message": "Could not comment"}],
+    }))
+    fake_run.set_rc(1)
+
+    result = make_github_issue_comments_batch([123, 456], "Review done", "owner", "repo")
+
+    assert result == ["IC_1", None]
+    assert len(fake_run.calls) == 1
+    cmd = fake_run.calls[0][0][0]
+    mutation = cmd[cmd.index("-f") + 1]
+    assert 'c0: addComment(input: {subjectId: "I_abc"' in mutation
+    assert 'c1: addComment(input: {subjectId: "I_def"' in mutation
+    assert f"body={ADW_BOT_IDENTIFIER}\n\nReview done" in cmd
+
+
+def test_comments_batch_unavailable_without_gh(fake_run):
+    """Test the batch reports None so callers can fall back to single posts."""
+    _issue_node_id_cache.clear()
+    fake_run.set_error(FileNotFoundError("gh not found"))
+
+    assert make_github_issue_comments_batch([123, 456], "Review done", "owner", "repo") is None
+
+
+def test_update_comments_batch_sends_one_mutation(fake_run):
+    """Test several comments are rewritten with a single aliased mutation."""
+    fake_run.set_stdout(json.dumps({
+        "data": {"u0": {"issueComment": {"id": "IC_1"}}, "u1": {"issueComment": {"id": "IC_2"}}},
+    }))
+
+    result = update_github_issue_comments_batch(["IC_1", "IC_2"], "Review done")
+
+    assert result == [True, True]
+    assert len(fake_run.calls) == 1
+    cmd = fake_run.calls[0][0][0]
+    mutation = cmd[cmd.index("-f") + 1]
+    assert 'u0: updateIssueComment(input: {id: "IC_1"' in mutation
+    assert 'u1: updateIssueComment(input: {id: "IC_2"' in mutation
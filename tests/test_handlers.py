@@ -12,10 +12,14 @@ Tests cover:
 import pytest
 import hmac
 import hashlib
+import ssl
 import time
 from unittest.mock import Mock, patch, AsyncMock
 from apps.adw_server.core.handlers import (
     validate_webhook_signature,
+    new_webhook_hmac,
+    verify_webhook_hmac,
+    get_hmac_backend,
     extract_repo_info,
     get_label_names,
     should_trigger_workflow,
@@ -26,8 +30,8 @@ from apps.adw_server.core.handlers import (
     GitHubIssue,
     GitHubLabel,
     GitHubUser,
-    _workflow_dedup_cache,
     DEDUP_WINDOW_SECONDS,
+    DEDUP_CACHE_MAXSIZE,
 )
 
 
@@ -95,6 +99,68 @@ def test_validate_webhook_signature_timing_attack_resistant():
     assert validate_webhook_signature(payload, f"sha256={invalid_sig}", secret) is False
 
 
+def test_validate_webhook_signature_reuses_keyed_hmac():
+    """Test repeated checks with a cached key don't leak state between bodies."""
+    secret = "test_secret_12345678"
+    first = b'{"action": "opened"}'
+    second = b'{"action": "closed"}'
+
+    for payload in (first, second, first):
+        signature = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+        assert validate_webhook_signature(payload, f"sha256={signature}", secret) is True
+
+    # A different secret gets its own key
+    assert validate_webhook_signature(first, f"sha256={signature}", "other_secret_1234") is False
+
+
+def test_webhook_hmac_fed_in_chunks():
+    """Test a signature checked chunk by chunk matches the whole-body check."""
+    secret = "test_secret_12345678"
+    payload = b'{"action": "opened", "number": 42}' * 100
+    signature = "sha256=" + hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+
+    mac = new_webhook_hmac(secret)
+    for start in range(0, len(payload), 1000):
+        mac.update(payload[start:start + 1000])
+
+    assert verify_webhook_hmac(mac, signature) is True
+    assert verify_webhook_hmac(new_webhook_hmac(secret), signature) is False
+
+
+def test_validate_webhook_signature_non_ascii_rejected():
+    """Test a signature with non-ASCII characters is rejected, not raised on."""
+    secret = "test_secret_12345678"
+    payload = b'{"action": "opened"}'
+
+    assert validate_webhook_signature(payload, "sha256=" + "\u00e9" * 64, secret) is False
+
+
+def test_validate_webhook_signature_truncated_digest_rejected():
+    """Test a hex signature of the wrong length is rejected."""
+    secret = "test_secret_12345678"
+    payload = b'{"action": "opened"}'
+    signature = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+
+    assert validate_webhook_signature(payload, f"sha256={signature[:-2]}", secret) is False
+    assert validate_webhook_signature(payload, f"sha256={signature[:-1]}", secret) is False
+
+
+def test_validate_webhook_signature_matches_hashlib_sha256():
+    """Test the OpenSSL-backed HMAC agrees with one built on hashlib.sha256.
+
+    The validator names the digest ("sha256") so CPython hands HMAC to
+    OpenSSL, which uses SHA-NI when the CPU and build support it. To check a
+    host, compare `openssl speed -evp sha256` with and without
+    OPENSSL_ia32cap="~0x20000000" (SHA-NI masked off).
+    """
+    secret = "test_secret_12345678"
+    payload = b'{"action": "opened"}' * 64
+
+    assert hashlib.sha256().name == "sha256"
+    expected_sig = hmac.new(secret.encode("utf-8"), payload, hashlib.sha256).hexdigest()
+
+    assert validate_webhook_signature(payload, f"sha256={expected_sig}", secret) is True
+
 # ============================================================================
 # Utility Function Tests
 # ============================================================================
@@ -106,6 +172,15 @@ def test_extract_repo_info():
     assert repo == "tac-challenge"
 
 
+def test_get_hmac_backend_reports_openssl():
+    """Test the HMAC backend report matches how hashlib was built."""
+    backend, uses_openssl = get_hmac_backend()
+
+    assert uses_openssl == (hashlib.sha256.__module__ == "_hashlib")
+    if uses_openssl:
+        assert backend == ssl.OPENSSL_VERSION
+
+
 def test_extract_repo_info_invalid():
     """Test extracting repo info with invalid format raises ValueError."""
     with pytest.raises(ValueError) as exc_info:
@@ -140,19 +215,14 @@ def test_get_label_names_empty():
 # Deduplication Tests
 # ============================================================================
 
-def test_should_trigger_workflow_first_trigger():
+def test_should_trigger_workflow_first_trigger(dedup_cache):
     """Test workflow triggers on first attempt."""
-    # Clear cache
-    _workflow_dedup_cache.clear()
-
     result = should_trigger_workflow(issue_number=123, workflow_type="chore")
     assert result is True
 
 
-def test_should_trigger_workflow_duplicate_blocked():
+def test_should_trigger_workflow_duplicate_blocked(dedup_cache):
     """Test workflow is blocked when triggered twice quickly."""
-    _workflow_dedup_cache.clear()
-
     # First trigger should succeed
     assert should_trigger_workflow(123, "chore") is True
 
@@ -160,53 +230,57 @@ def test_should_trigger_workflow_duplicate_blocked():
     assert should_trigger_workflow(123, "chore") is False
 
 
-def test_should_trigger_workflow_expired_cache():
+def test_should_trigger_workflow_expired_cache(dedup_cache):
     """Test workflow triggers again after dedup window expires."""
-    _workflow_dedup_cache.clear()
-
     # First trigger
     should_trigger_workflow(123, "chore")
 
     # Manually set cache timestamp to expired time
-    _workflow_dedup_cache[(123, "chore")] = time.time() - DEDUP_WINDOW_SECONDS - 1
+    dedup_cache[(123, "chore")] = time.time() - DEDUP_WINDOW_SECONDS - 1
 
     # Should trigger again since cache expired
     result = should_trigger_workflow(123, "chore")
     assert result is True
 
 
-def test_should_trigger_workflow_different_issue():
+def test_should_trigger_workflow_different_issue(dedup_cache):
     """Test workflows for different issues don't interfere."""
-    _workflow_dedup_cache.clear()
-
     assert should_trigger_workflow(123, "chore") is True
     assert should_trigger_workflow(456, "chore") is True
 
 
-def test_should_trigger_workflow_different_type():
+def test_should_trigger_workflow_different_type(dedup_cache):
     """Test workflows of different types don't interfere."""
-    _workflow_dedup_cache.clear()
-
     assert should_trigger_workflow(123, "chore") is True
     assert should_trigger_workflow(123, "chore_implement") is True
 
 
+def test_should_trigger_workflow_cache_is_bounded(dedup_cache):
+    """Test the dedup cache never holds more than its configured maxsize."""
+    for issue_number in range(DEDUP_CACHE_MAXSIZE + 10):
+        should_trigger_workflow(issue_number, "chore")
+
+    assert len(dedup_cache) == DEDUP_CACHE_MAXSIZE
+
+
 # ============================================================================
 # Workflow Determination Tests
 # ============================================================================
 
-def test_determine_workflow_for_issue_bug_label():
-    """Test bug label triggers chore_implement workflow."""
-    _workflow_dedup_cache.clear()
-
-    issue = GitHubIssue(
+@pytest.fixture(scope="session")
+def bug_issue():
+    """Provide a validated bug-labelled issue; derive variants with model_copy."""
+    return GitHubIssue(
         number=123,
         title="Fix login bug",
         body="Login fails with error 500",
         labels=[GitHubLabel(name="bug", color="d73a4a")]
     )
 
-    result = determine_workflow_for_issue(issue, "opened")
+
+def test_determine_workflow_for_issue_bug_label(bug_issue, dedup_cache):
+    """Test bug label triggers chore_implement workflow."""
+    result = determine_workflow_for_issue(bug_issue, "opened")
     assert result is not None
     workflow_type, prompt = result
     assert workflow_type == "chore_implement"
@@ -214,10 +288,8 @@ def test_determine_workflow_for_issue_bug_label():
     assert "Fix login bug" in prompt
 
 
-def test_determine_workflow_for_issue_implement_label():
+def test_determine_workflow_for_issue_implement_label(dedup_cache):
     """Test implement label triggers chore_implement workflow."""
-    _workflow_dedup_cache.clear()
-
     issue = GitHubIssue(
         number=124,
         title="Add feature X",
@@ -230,10 +302,8 @@ def test_determine_workflow_for_issue_implement_label():
     assert workflow_type == "chore_implement"
 
 
-def test_determine_workflow_for_issue_feature_label():
+def test_determine_workflow_for_issue_feature_label(dedup_cache):
     """Test feature label triggers chore workflow (planning only)."""
-    _workflow_dedup_cache.clear()
-
     issue = GitHubIssue(
         number=125,
         title="Add authentication",
@@ -246,10 +316,8 @@ def test_determine_workflow_for_issue_feature_label():
     assert workflow_type == "chore"
 
 
-def test_determine_workflow_for_issue_chore_label():
+def test_determine_workflow_for_issue_chore_label(dedup_cache):
     """Test chore label triggers chore workflow."""
-    _workflow_dedup_cache.clear()
-
     issue = GitHubIssue(
         number=126,
         title="Update dependencies",
@@ -262,10 +330,8 @@ def test_determine_workflow_for_issue_chore_label():
     assert workflow_type == "chore"
 
 
-def test_determine_workflow_for_issue_no_matching_label():
+def test_determine_workflow_for_issue_no_matching_label(dedup_cache):
     """Test no workflow triggered for issues without matching labels."""
-    _workflow_dedup_cache.clear()
-
     issue = GitHubIssue(
         number=127,
         title="Question about docs",
@@ -276,31 +342,35 @@ def test_determine_workflow_for_issue_no_matching_label():
     assert result is None
 
 
-def test_determine_workflow_for_issue_wrong_action():
-    """Test no workflow triggered for non-opened/labeled actions."""
-    _workflow_dedup_cache.clear()
-
+def test_determine_workflow_for_issue_label_priority(dedup_cache):
+    """Test bug outranks feature regardless of label order on the issue."""
     issue = GitHubIssue(
-        number=128,
-        title="Fix bug",
-        labels=[GitHubLabel(name="bug", color="d73a4a")]
+        number=130,
+        title="Broken feature",
+        labels=[
+            GitHubLabel(name="feature", color="a2eeef"),
+            GitHubLabel(name="bug", color="d73a4a"),
+        ]
     )
 
+    result = determine_workflow_for_issue(issue, "opened")
+    assert result is not None
+    workflow_type, _ = result
+    assert workflow_type == "chore_implement"
+
+
+def test_determine_workflow_for_issue_wrong_action(bug_issue, dedup_cache):
+    """Test no workflow triggered for non-opened/labeled actions."""
+    issue = bug_issue.model_copy(update={"number": 128, "title": "Fix bug", "body": None})
+
     result = determine_workflow_for_issue(issue, "closed")
     assert result is None
 
 
-def test_determine_workflow_for_issue_truncates_long_body():
+def test_determine_workflow_for_issue_truncates_long_body(bug_issue, dedup_cache):
     """Test issue body is truncated if too long."""
-    _workflow_dedup_cache.clear()
-
     long_body = "A" * 1000
-    issue = GitHubIssue(
-        number=129,
-        title="Test",
-        body=long_body,
-        labels=[GitHubLabel(name="bug", color="d73a4a")]
-    )
+    issue = bug_issue.model_copy(update={"number": 129, "title": "Test", "body": long_body})
 
     result = determine_workflow_for_issue(issue, "opened")
     assert result is not None
@@ -341,7 +411,7 @@ async def test_handle_issue_event_no_workflow():
 
 
 @pytest.mark.asyncio
-async def test_handle_issue_event_chore_workflow():
+async def test_handle_issue_event_chore_workflow(dedup_cache):
     """Test handle_issue_event triggers chore workflow for feature label."""
     from apps.adw_server.core.handlers import (
         IssueWebhookPayload,
@@ -349,8 +419,6 @@ async def test_handle_issue_event_chore_workflow():
         WorkflowResult,
     )
 
-    _workflow_dedup_cache.clear()
-
     payload = IssueWebhookPayload(
         action="opened",
         issue=GitHubIssue(
@@ -400,7 +468,7 @@ async def test_handle_issue_event_chore_workflow():
 
 
 @pytest.mark.asyncio
-async def test_handle_issue_event_chore_implement_workflow():
+async def test_handle_issue_event_chore_implement_workflow(dedup_cache):
     """Test handle_issue_event triggers chore_implement workflow for bug label."""
     from apps.adw_server.core.handlers import (
         IssueWebhookPayload,
@@ -408,8 +476,6 @@ async def test_handle_issue_event_chore_implement_workflow():
         WorkflowResult,
     )
 
-    _workflow_dedup_cache.clear()
-
     payload = IssueWebhookPayload(
         action="opened",
         issue=GitHubIssue(
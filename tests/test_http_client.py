@@ -0,0 +1,44 @@
+"""Tests for the shared GitHub API client.
+
+Tests cover:
+- The client is created once and reused
+- Closing releases the client and the next call creates a new one
+"""
+
+import pytest
+from apps.adw_server.core.http_client import (
+    GITHUB_API_URL,
+    close_github_client,
+    get_github_client,
+)
+
+
+@pytest.fixture(autouse=True)
+def closed_client():
+    """Start and finish each test without a shared client."""
+    close_github_client()
+    yield
+    close_github_client()
+
+
+def test_client_is_reused():
+    """Test repeated calls return the same client."""
+    client = get_github_client()
+
+    assert get_github_client() is client
+    assert str(client.base_url).rstrip("/") == GITHUB_API_URL
+
+
+def test_close_releases_client():
+    """Test closing the client makes the next call build a new one."""
+    client = get_github_client()
+
+    close_github_client()
+
+    assert client.is_closed
+    assert get_github_client() is not client
+
+
+def test_close_without_client_is_noop():
+    """Test closing before any request does nothing."""
+    close_github_client()
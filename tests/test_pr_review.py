@@ -10,15 +10,13 @@ Tests cover:
 - Error handling and comment posting
 """
 
-import pytest
-from unittest.mock import Mock, patch, AsyncMock
-import sys
 import os
+import tempfile
 
-# Add adw_server to path for imports
-adw_server_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "apps", "adw_server")
-if adw_server_dir not in sys.path:
-    sys.path.insert(0, adw_server_dir)
+import pytest
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from unittest.mock import DEFAULT, Mock, patch, AsyncMock
 
 from core.handlers import (
     extract_issue_references,
@@ -29,71 +27,48 @@ from core.handlers import (
     GitHubUser,
 )
 from core.adw_integration import WorkflowResult
+from core import adw_integration, handlers
+
+# WorkflowResult is frozen, so one instance can be shared by every handler test
+_SUCCESS_RESULT = WorkflowResult.ok("Review completed", None, "test123", output_dir="/tmp/test")
 
 
 class TestExtractIssueReferences:
     """Test issue reference extraction from PR body."""
 
-    def test_single_issue_closes(self):
-        """Test extracting single issue with 'Closes' keyword."""
-        pr_body = "Closes #123"
-        issues = extract_issue_references(pr_body)
-        assert issues == [123]
-
-    def test_single_issue_fixes(self):
-        """Test extracting single issue with 'Fixes' keyword."""
-        pr_body = "Fixes #456"
-        issues = extract_issue_references(pr_body)
-        assert issues == [456]
-
-    def test_single_issue_resolves(self):
-        """Test extracting single issue with 'Resolves' keyword."""
-        pr_body = "Resolves #789"
-        issues = extract_issue_references(pr_body)
-        assert issues == [789]
-
-    def test_multiple_issues(self):
-        """Test extracting multiple issue references."""
-        pr_body = "Fixes #123 and resolves #456"
-        issues = extract_issue_references(pr_body)
-        assert set(issues) == {123, 456}
-
-    def test_no_references(self):
-        """Test PR description without issue references."""
-        pr_body = "Some PR description without issue links"
-        issues = extract_issue_references(pr_body)
-        assert issues == []
-
-    def test_case_insensitive(self):
-        """Test case-insensitive keyword matching."""
-        test_cases = [
-            "CLOSES #123",
-            "closes #123",
-            "Closes #123",
-            "FIXES #456",
-            "fixes #456",
-            "Fixes #456",
-        ]
-        for pr_body in test_cases:
-            issues = extract_issue_references(pr_body)
-            assert len(issues) == 1
-            assert issues[0] in [123, 456]
-
-    def test_duplicate_references(self):
-        """Test that duplicate issue references are deduplicated."""
-        pr_body = "Closes #123 and fixes #123"
-        issues = extract_issue_references(pr_body)
-        assert issues == [123]
-
-    def test_empty_body(self):
-        """Test handling of empty PR body."""
-        issues = extract_issue_references("")
-        assert issues == []
-
-    def test_none_body(self):
-        """Test handling of None PR body."""
-        issues = extract_issue_references(None)
-        assert issues == []
+    @pytest.mark.parametrize("pr_body,expected", [
+        pytest.param("Closes #123", [123], id="closes"),
+        pytest.param("Fixes #456", [456], id="fixes"),
+        pytest.param("Resolves #789", [789], id="resolves"),
+        pytest.param("Fixes #123 and resolves #456", [123, 456], id="multiple"),
+        pytest.param("CLOSES #123", [123], id="upper-closes"),
+        pytest.param("closes #123", [123], id="lower-closes"),
+        pytest.param("FIXES #456", [456], id="upper-fixes"),
+        pytest.param("fixes #456", [456], id="lower-fixes"),
+        pytest.param("ReSoLvEs #789", [789], id="mixed-case-resolves"),
+        pytest.param("Closes #123 and fixes #123", [123], id="duplicate"),
+        pytest.param("Fixes #456, closes #123 and resolves #456", [456, 123], id="first-seen-order"),
+        pytest.param("Prefixes #12 are handled; closes #34", [34], id="keyword-inside-word"),
+    ])
+    def test_extracts_references(self, pr_body, expected):
+        """Test closing keywords yield deduplicated issue numbers in order."""
+        assert extract_issue_references(pr_body) == expected
+
+    @pytest.mark.parametrize("pr_body", [
+        pytest.param("Some PR description without issue links", id="no-references"),
+        pytest.param("This closes the gap and fixes 123 flaky tests", id="keywords-without-number"),
+        pytest.param("", id="empty"),
+        pytest.param(None, id="none"),
+    ])
+    def test_no_references(self, pr_body):
+        """Test bodies without closing references yield no issues."""
+        assert extract_issue_references(pr_body) == []
+
+    def test_repeated_body_returns_independent_lists(self):
+        """Test cached results are not shared between callers."""
+        first = extract_issue_references("Closes #123")
+        first.append(999)
+        assert extract_issue_references("Closes #123") == [123]
 
 
 class TestFormatReviewResults:
@@ -163,7 +138,22 @@ class TestFormatReviewResults:
         )
 
         # Should extract test counts
-        assert "15" in comment or "2" in comment
+        assert "✅ 15 passed | ❌ 2 failed" in comment
+
+    def test_test_results_use_first_counts(self):
+        """Test the first passed/failed counts win and a missing count is 0."""
+        review_output = """
+        Tests: 3 FAILED after retry
+        Earlier run: 7 failed
+        """
+        comment = format_review_results(
+            review_output=review_output,
+            pr_number=42,
+            pr_url="https://github.com/owner/repo/pull/42",
+            adw_id="abc12345",
+        )
+
+        assert "✅ 0 passed | ❌ 3 failed" in comment
 
     def test_summary_extraction(self):
         """Test extraction of summary section from review output."""
@@ -184,16 +174,62 @@ class TestFormatReviewResults:
             adw_id="abc12345",
         )
 
-        assert "This PR adds new features" in comment or "Summary" in comment
+        assert "### Review Summary\nThis PR adds new features" in comment
+
+    def test_summary_extraction_between_sections(self):
+        """Test summary is isolated when other sections surround it."""
+        review_output = (
+            "## Approval Status\nAPPROVED\n"
+            "## Summary\nSolid change with good tests.\n"
+            "## Issues Found\nMinor: rename variable\n"
+        )
+        comment = format_review_results(
+            review_output=review_output,
+            pr_number=42,
+            pr_url="https://github.com/owner/repo/pull/42",
+            adw_id="abc12345",
+        )
+
+        assert "Solid change with good tests." in comment
+        assert "rename variable" not in comment
+
+    def test_summary_after_empty_section(self):
+        """Test an empty section before the summary doesn't swallow it."""
+        review_output = (
+            "## Approval Status\nAPPROVED\n\n"
+            "## Issues Found\n\n"
+            "## Summary\nLooks good overall.\n"
+        )
+        comment = format_review_results(
+            review_output=review_output,
+            pr_number=42,
+            pr_url="https://github.com/owner/repo/pull/42",
+            adw_id="abc12345",
+        )
+
+        assert "### Review Summary\nLooks good overall." in comment
+        assert "Check the review output for details" not in comment
 
 
 class TestHandlePullRequestEvent:
     """Test PR event handler workflow trigger logic."""
 
-    @pytest.fixture
+    @pytest.fixture(autouse=True)
+    def no_graphql(self):
+        """Make batched GraphQL comments unavailable unless a test patches them."""
+        with patch.object(handlers, "run_gh_graphql", return_value=None):
+            yield
+
+    @pytest.fixture(scope="class")
     def mock_pr_payload(self):
-        """Create a mock PR webhook payload."""
-        return PullRequestWebhookPayload(
+        """Create a mock PR webhook payload shared by the class.
+
+        The model is frozen; tests that need a variant derive one with
+        model_copy(update=...) instead of mutating the shared instance.
+        The data is fixed, so validation is skipped with model_construct;
+        parsing a real payload is covered by the handler and server tests.
+        """
+        return PullRequestWebhookPayload.model_construct(
             action="opened",
             number=42,
             pull_request={
@@ -207,79 +243,102 @@ class TestHandlePullRequestEvent:
                     "ref": "main",
                 },
             },
-            repository=GitHubRepository(
+            repository=GitHubRepository.model_construct(
                 name="repo",
                 full_name="owner/repo",
                 html_url="https://github.com/owner/repo",
                 default_branch="main",
             ),
-            sender=GitHubUser(login="testuser", id=1, type="User"),
+            sender=GitHubUser.model_construct(login="testuser", id=1, type="User"),
         )
 
-    @pytest.mark.asyncio
     async def test_opened_action_triggers_review(self, mock_pr_payload):
         """Test that 'opened' action triggers review workflow."""
-        with patch("core.handlers.trigger_review_workflow", new_callable=AsyncMock) as mock_trigger:
-            with patch("core.handlers.make_github_issue_comment"):
-                mock_trigger.return_value = WorkflowResult(
-                    success=True,
-                    output="Review completed",
-                    adw_id="test123",
-                    output_dir="/tmp/test",
-                )
-
-                result = await handle_pull_request_event(
-                    payload=mock_pr_payload,
-                    working_dir="/tmp",
-                    model="sonnet",
-                )
-
-                assert result["workflow_triggered"] is True
-                assert result["workflow_type"] == "review"
-                assert result["pr_number"] == 42
-                assert mock_trigger.called
-
-    @pytest.mark.asyncio
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+        ) as mocks:
+            mock_trigger = mocks["trigger_review_workflow"]
+            mock_trigger.return_value = _SUCCESS_RESULT
+
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            assert result["workflow_triggered"] is True
+            assert result["workflow_type"] == "review"
+            assert result["pr_number"] == 42
+            assert mock_trigger.called
+
     async def test_synchronize_action_triggers_review(self, mock_pr_payload):
         """Test that 'synchronize' action triggers review workflow."""
-        mock_pr_payload.action = "synchronize"
-
-        with patch("core.handlers.trigger_review_workflow", new_callable=AsyncMock) as mock_trigger:
-            with patch("core.handlers.make_github_issue_comment"):
-                mock_trigger.return_value = WorkflowResult(
-                    success=True,
-                    output="Review completed",
-                    adw_id="test123",
-                    output_dir="/tmp/test",
-                )
-
-                result = await handle_pull_request_event(
-                    payload=mock_pr_payload,
-                    working_dir="/tmp",
-                    model="sonnet",
-                )
-
-                assert result["workflow_triggered"] is True
-                assert mock_trigger.called
-
-    @pytest.mark.asyncio
+        mock_pr_payload = mock_pr_payload.model_copy(update={"action": "synchronize"})
+
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+        ) as mocks:
+            mock_trigger = mocks["trigger_review_workflow"]
+            mock_trigger.return_value = _SUCCESS_RESULT
+
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            assert result["workflow_triggered"] is True
+            assert mock_trigger.called
+
+    async def test_issue_context_passed_to_review_actions(self, mock_pr_payload):
+        """Test the primary issue is fetched for re-implementation context."""
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+            fetch_issue_context=DEFAULT,
+            handle_review_results=DEFAULT,
+        ) as mocks:
+            mocks["trigger_review_workflow"].return_value = _SUCCESS_RESULT
+            mocks["fetch_issue_context"].return_value = ("Add login", "# Add login\n\nDetails")
+            mocks["handle_review_results"].return_value = {"action": "comment", "success": True}
+
+            await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            mocks["fetch_issue_context"].assert_called_once_with(123, "owner/repo")
+            review_kwargs = mocks["handle_review_results"].call_args.kwargs
+            assert review_kwargs["issue_title"] == "Add login"
+            assert review_kwargs["original_prompt"] == "# Add login\n\nDetails"
+
     async def test_closed_action_does_not_trigger_review(self, mock_pr_payload):
         """Test that 'closed' action does not trigger review."""
-        mock_pr_payload.action = "closed"
+        mock_pr_payload = mock_pr_payload.model_copy(update={"action": "closed"})
 
-        result = await handle_pull_request_event(
-            payload=mock_pr_payload,
-            working_dir="/tmp",
-            model="sonnet",
-        )
+        with patch.object(handlers, "extract_issue_references") as mock_extract:
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
 
         assert result["workflow_triggered"] is False
         assert "does not trigger review" in result["reason"]
+        # The action check runs before the PR body is scanned
+        mock_extract.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_pr_without_issue_references_skips_workflow(self, mock_pr_payload):
         """Test that PR without issue references skips workflow."""
-        mock_pr_payload.pull_request["body"] = "Just a regular PR description"
+        mock_pr_payload = mock_pr_payload.model_copy(update={
+            "pull_request": {**mock_pr_payload.pull_request, "body": "Just a regular PR description"}
+        })
 
         result = await handle_pull_request_event(
             payload=mock_pr_payload,
@@ -290,253 +349,298 @@ class TestHandlePullRequestEvent:
         assert result["workflow_triggered"] is False
         assert "No issue references" in result["reason"]
 
-    @pytest.mark.asyncio
     async def test_multiple_issue_references(self, mock_pr_payload):
         """Test handling of multiple issue references."""
-        mock_pr_payload.pull_request["body"] = "Fixes #123 and resolves #456"
-
-        with patch("core.handlers.trigger_review_workflow", new_callable=AsyncMock) as mock_trigger:
-            with patch("core.handlers.make_github_issue_comment") as mock_comment:
-                mock_trigger.return_value = WorkflowResult(
-                    success=True,
-                    output="Review completed",
-                    adw_id="test123",
-                    output_dir="/tmp/test",
-                )
-
-                result = await handle_pull_request_event(
-                    payload=mock_pr_payload,
-                    working_dir="/tmp",
-                    model="sonnet",
-                )
-
-                assert result["workflow_triggered"] is True
-                assert set(result["issue_numbers"]) == {123, 456}
-                # Should post comments to both issues (2 initial + 2 final = 4 total)
-                assert mock_comment.call_count == 4
-
-    @pytest.mark.asyncio
+        mock_pr_payload = mock_pr_payload.model_copy(update={
+            "pull_request": {**mock_pr_payload.pull_request, "body": "Fixes #123 and resolves #456"}
+        })
+
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comments_batch=DEFAULT,
+            update_github_issue_comments_batch=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+        ) as mocks:
+            mock_trigger = mocks["trigger_review_workflow"]
+            mock_batch = mocks["make_github_issue_comments_batch"]
+            mock_update = mocks["update_github_issue_comments_batch"]
+            mock_comment = mocks["make_github_issue_comment"]
+            mock_batch.return_value = ["IC_1", "IC_2"]
+            mock_update.return_value = [True, True]
+            mock_trigger.return_value = _SUCCESS_RESULT
+
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            assert result["workflow_triggered"] is True
+            assert set(result["issue_numbers"]) == {123, 456}
+            # The start comment is posted to both issues in one batch, then
+            # rewritten in place with the results in one more
+            mock_batch.assert_called_once()
+            assert mock_batch.call_args.kwargs["issue_numbers"] == [123, 456]
+            mock_update.assert_called_once()
+            assert mock_update.call_args.kwargs["comment_ids"] == ["IC_1", "IC_2"]
+            assert "Pull Request Review" in mock_update.call_args.kwargs["comment"]
+            mock_comment.assert_not_called()
+
+    async def test_comment_failure_does_not_block_other_issues(self, mock_pr_payload):
+        """Test that a failed post to one issue still posts to the others."""
+        mock_pr_payload = mock_pr_payload.model_copy(update={
+            "pull_request": {**mock_pr_payload.pull_request, "body": "Fixes #123 and resolves #456"}
+        })
+
+        def post_comment(issue_number, **kwargs):
+            if issue_number == 123:
+                raise RuntimeError("gh failed")
+            return True
+
+        # Batch unavailable, so each issue is posted to separately
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comments_batch=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+        ) as mocks:
+            mock_trigger = mocks["trigger_review_workflow"]
+            mock_comment = mocks["make_github_issue_comment"]
+            mocks["make_github_issue_comments_batch"].return_value = None
+            mock_comment.side_effect = post_comment
+            mock_trigger.return_value = _SUCCESS_RESULT
+
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            assert result["workflow_triggered"] is True
+            posted_to = [call.kwargs["issue_number"] for call in mock_comment.call_args_list]
+            assert posted_to.count(456) == 2
+
     async def test_error_handling_posts_error_comment(self, mock_pr_payload):
         """Test that errors during review workflow post error comments."""
-        with patch("core.handlers.trigger_review_workflow", new_callable=AsyncMock) as mock_trigger:
-            with patch("core.handlers.make_github_issue_comment") as mock_comment:
-                mock_trigger.side_effect = Exception("Test error")
-
-                result = await handle_pull_request_event(
-                    payload=mock_pr_payload,
-                    working_dir="/tmp",
-                    model="sonnet",
-                )
-
-                assert result["success"] is False
-                assert "Test error" in result["error_message"]
-                # Should post initial comment + error comment
-                assert mock_comment.call_count >= 2
-
-                # Check that error comment was posted
-                error_comment_posted = False
-                for call in mock_comment.call_args_list:
-                    if "Failed" in str(call) or "error" in str(call):
-                        error_comment_posted = True
-                        break
-                assert error_comment_posted
+        with patch.multiple(
+            handlers,
+            trigger_review_workflow=DEFAULT,
+            make_github_issue_comment=DEFAULT,
+        ) as mocks:
+            mock_trigger = mocks["trigger_review_workflow"]
+            mock_comment = mocks["make_github_issue_comment"]
+            mock_trigger.side_effect = Exception("Test error")
+
+            result = await handle_pull_request_event(
+                payload=mock_pr_payload,
+                working_dir="/tmp",
+                model="sonnet",
+            )
+
+            assert result["success"] is False
+            assert "Test error" in result["error_message"]
+            # Should post initial comment + error comment
+            assert mock_comment.call_count >= 2
+
+            # Check that error comment was posted
+            comments = [call.kwargs["comment"] for call in mock_comment.call_args_list]
+            assert any("Review Failed" in comment and "Test error" in comment for comment in comments)
+
+
+# Canned _run_git results; the review workflow only reads these attributes
+_GIT_OK = SimpleNamespace(returncode=0, stdout="", stderr="")
+_GIT_FAIL = SimpleNamespace(returncode=1, stdout="", stderr="Error: not found")
+
+
+@contextmanager
+def _patch_review_run():
+    """Patch the template runner, git and the event loop in one stack.
+
+    Yields (mock_execute, mock_run); mock_run is the async _run_git
+    replacement. execute_template still runs on the module's executor.
+    """
+    with ExitStack() as stack:
+        mock_execute = stack.enter_context(patch.object(adw_integration, "execute_template"))
+        mock_run = stack.enter_context(patch.object(adw_integration, "_run_git", new_callable=AsyncMock))
+        yield mock_execute, mock_run
 
 
 class TestTriggerReviewWorkflow:
     """Test review workflow trigger function."""
 
-    @pytest.mark.asyncio
     async def test_trigger_review_workflow_success(self):
         """Test successful review workflow execution."""
         from core.adw_integration import trigger_review_workflow
 
-        with patch("core.adw_integration.execute_template") as mock_execute:
-            with patch("core.adw_integration.subprocess.run") as mock_run:
-                # Mock git operations
-                mock_run.return_value = Mock(returncode=0, stdout="main\n", stderr="")
-
-                mock_response = Mock()
-                mock_response.success = True
-                mock_response.output = "Review completed successfully"
-                mock_response.session_id = "session123"
-                mock_execute.return_value = mock_response
-
-                with patch("asyncio.get_event_loop") as mock_loop:
-                    mock_loop.return_value.run_in_executor = AsyncMock(return_value=mock_response)
-
-                    result = await trigger_review_workflow(
-                        pr_number=42,
-                        repo_full_name="owner/repo",
-                        adw_id="test123",
-                        model="sonnet",
-                        working_dir="/tmp",
-                        pr_head_ref="feature-branch",
-                        pr_head_sha="abc123",
-                        pr_base_ref="main",
-                    )
-
-                    assert result.success is True
-                    assert result.output == "Review completed successfully"
-                    assert result.adw_id == "test123"
-                    assert "reviewer" in result.output_dir
-
-    @pytest.mark.asyncio
+        with _patch_review_run() as (mock_execute, mock_run):
+            # Mock git operations
+            mock_run.return_value = _GIT_OK
+
+            mock_response = Mock()
+            mock_response.success = True
+            mock_response.output = "Review completed successfully"
+            mock_response.session_id = "session123"
+            mock_execute.return_value = mock_response
+
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                model="sonnet",
+                working_dir="/tmp",
+                pr_head_ref="feature-branch",
+                pr_head_sha="abc123",
+                pr_base_ref="main",
+            )
+
+            assert result.success is True
+            assert result.output == "Review completed successfully"
+            assert result.adw_id == "test123"
+            assert "reviewer" in result.output_dir
+
     async def test_trigger_review_workflow_failure(self):
         """Test review workflow execution failure."""
         from core.adw_integration import trigger_review_workflow
 
-        with patch("core.adw_integration.execute_template") as mock_execute:
-            with patch("core.adw_integration.subprocess.run") as mock_run:
-                # Mock git operations
-                mock_run.return_value = Mock(returncode=0, stdout="main\n", stderr="")
+        with _patch_review_run() as (mock_execute, mock_run):
+            # Mock git operations
+            mock_run.return_value = _GIT_OK
 
-                mock_execute.side_effect = Exception("Execution failed")
+            mock_execute.side_effect = Exception("Execution failed")
 
-                with patch("asyncio.get_event_loop") as mock_loop:
-                    mock_loop.return_value.run_in_executor = AsyncMock(side_effect=Exception("Execution failed"))
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                model="sonnet",
+                working_dir="/tmp",
+                pr_head_ref="feature-branch",
+                pr_head_sha="abc123",
+                pr_base_ref="main",
+            )
 
-                    result = await trigger_review_workflow(
-                        pr_number=42,
-                        repo_full_name="owner/repo",
-                        adw_id="test123",
-                        model="sonnet",
-                        working_dir="/tmp",
-                        pr_head_ref="feature-branch",
-                        pr_head_sha="abc123",
-                        pr_base_ref="main",
-                    )
+            assert result.success is False
+            assert "Execution failed" in result.error_message
 
-                    assert result.success is False
-                    assert "Execution failed" in result.error_message
-
-    @pytest.mark.asyncio
     async def test_branch_checkout_success(self):
-        """Test successful PR branch checkout before review."""
+        """Test the PR is reviewed in a worktree pinned to the head SHA."""
         from core.adw_integration import trigger_review_workflow
 
-        with patch("core.adw_integration.execute_template") as mock_execute:
-            with patch("core.adw_integration.subprocess.run") as mock_run:
-                # Mock git operations sequence
-                git_calls = []
-                def mock_git_run(cmd, **kwargs):
-                    git_calls.append(cmd)
-                    if "rev-parse" in cmd:
-                        return Mock(returncode=0, stdout="main\n", stderr="")
-                    elif "fetch" in cmd and "pull/42/head" in " ".join(cmd):
-                        return Mock(returncode=0, stdout="", stderr="")
-                    elif "checkout" in cmd and "pr-42" in " ".join(cmd):
-                        return Mock(returncode=0, stdout="", stderr="")
-                    elif "reset" in cmd:
-                        return Mock(returncode=0, stdout="", stderr="")
-                    elif "checkout" in cmd and "main" in " ".join(cmd):
-                        return Mock(returncode=0, stdout="", stderr="")
-                    return Mock(returncode=0, stdout="", stderr="")
-
-                mock_run.side_effect = mock_git_run
-
-                mock_response = Mock()
-                mock_response.success = True
-                mock_response.output = "Review completed"
-                mock_response.session_id = "session123"
-
-                with patch("asyncio.get_event_loop") as mock_loop:
-                    mock_loop.return_value.run_in_executor = AsyncMock(return_value=mock_response)
-
-                    result = await trigger_review_workflow(
-                        pr_number=42,
-                        repo_full_name="owner/repo",
-                        adw_id="test123",
-                        model="sonnet",
-                        working_dir="/tmp",
-                        pr_head_ref="feature-branch",
-                        pr_head_sha="abc123",
-                        pr_base_ref="main",
-                    )
-
-                    assert result.success is True
-                    # Verify git operations were called
-                    assert len(git_calls) > 0
-                    # Should fetch PR branch
-                    assert any("fetch" in " ".join(call) for call in git_calls)
-                    # Should checkout PR branch
-                    assert any("checkout" in " ".join(call) for call in git_calls)
-
-    @pytest.mark.asyncio
+        with _patch_review_run() as (mock_execute, mock_run):
+            mock_run.return_value = _GIT_OK
+
+            mock_response = Mock()
+            mock_response.success = True
+            mock_response.output = "Review completed"
+            mock_response.session_id = "session123"
+            mock_execute.return_value = mock_response
+
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                model="sonnet",
+                working_dir="/tmp",
+                pr_head_ref="feature-branch",
+                pr_head_sha="abc123",
+                pr_base_ref="main",
+            )
+
+            assert result.success is True
+            git_calls = [call.args[0] for call in mock_run.call_args_list]
+            worktree = os.path.join(tempfile.gettempdir(), "adw-review-test123")
+            # Fetch, review in a detached worktree, then remove it; the
+            # server's own checkout is never switched
+            assert git_calls == [
+                ["git", "fetch", "origin", "pull/42/head:pr-42"],
+                ["git", "worktree", "add", "--detach", worktree, "abc123"],
+                ["git", "worktree", "remove", "--force", worktree],
+            ]
+            assert all(call.kwargs["cwd"] == "/tmp" for call in mock_run.call_args_list)
+            assert mock_execute.call_args.args[0].working_dir == worktree
+
     async def test_branch_checkout_cleanup_on_error(self):
-        """Test that original branch is restored even when review fails."""
+        """Test that the review worktree is removed even when review fails."""
         from core.adw_integration import trigger_review_workflow
 
-        with patch("core.adw_integration.execute_template") as mock_execute:
-            with patch("core.adw_integration.subprocess.run") as mock_run:
-                checkout_calls = []
-                def mock_git_run(cmd, **kwargs):
-                    if "checkout" in cmd:
-                        checkout_calls.append(cmd)
-                    if "rev-parse" in cmd:
-                        return Mock(returncode=0, stdout="main\n", stderr="")
-                    return Mock(returncode=0, stdout="", stderr="")
-
-                mock_run.side_effect = mock_git_run
-                mock_execute.side_effect = Exception("Review failed")
-
-                with patch("asyncio.get_event_loop") as mock_loop:
-                    mock_loop.return_value.run_in_executor = AsyncMock(side_effect=Exception("Review failed"))
-
-                    result = await trigger_review_workflow(
-                        pr_number=42,
-                        repo_full_name="owner/repo",
-                        adw_id="test123",
-                        model="sonnet",
-                        working_dir="/tmp",
-                        pr_head_ref="feature-branch",
-                        pr_head_sha="abc123",
-                        pr_base_ref="main",
-                    )
-
-                    assert result.success is False
-                    # Should restore to main branch
-                    assert any("main" in " ".join(call) for call in checkout_calls)
-
-    @pytest.mark.asyncio
+        with _patch_review_run() as (mock_execute, mock_run):
+            mock_run.return_value = _GIT_OK
+            mock_execute.side_effect = Exception("Review failed")
+
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                model="sonnet",
+                working_dir="/tmp",
+                pr_head_ref="feature-branch",
+                pr_head_sha="abc123",
+                pr_base_ref="main",
+            )
+
+            assert result.success is False
+            # Should remove the worktree
+            assert mock_run.call_args.args[0][:3] == ["git", "worktree", "remove"]
+
     async def test_git_fetch_failure_fallback(self):
         """Test fallback to branch name when PR fetch fails."""
         from core.adw_integration import trigger_review_workflow
 
-        with patch("core.adw_integration.execute_template") as mock_execute:
-            with patch("core.adw_integration.subprocess.run") as mock_run:
-                def mock_git_run(cmd, **kwargs):
-                    if "rev-parse" in cmd:
-                        return Mock(returncode=0, stdout="main\n", stderr="")
-                    elif "fetch" in cmd and "pull/42/head" in " ".join(cmd):
-                        # Fail first fetch
-                        return Mock(returncode=1, stdout="", stderr="Error: not found")
-                    elif "fetch" in cmd and "feature-branch" in " ".join(cmd):
-                        # Succeed on branch name fetch
-                        return Mock(returncode=0, stdout="", stderr="")
-                    elif "checkout" in cmd:
-                        return Mock(returncode=0, stdout="", stderr="")
-                    return Mock(returncode=0, stdout="", stderr="")
-
-                mock_run.side_effect = mock_git_run
-
-                mock_response = Mock()
-                mock_response.success = True
-                mock_response.output = "Review completed"
-                mock_response.session_id = "session123"
-
-                with patch("asyncio.get_event_loop") as mock_loop:
-                    mock_loop.return_value.run_in_executor = AsyncMock(return_value=mock_response)
-
-                    result = await trigger_review_workflow(
-                        pr_number=42,
-                        repo_full_name="owner/repo",
-                        adw_id="test123",
-                        model="sonnet",
-                        working_dir="/tmp",
-                        pr_head_ref="feature-branch",
-                        pr_head_sha="abc123",
-                        pr_base_ref="main",
-                    )
-
-                    # Should still succeed despite PR fetch failure
-                    assert result.success is True
+        with _patch_review_run() as (mock_execute, mock_run):
+            def mock_git_run(cmd, **kwargs):
+                if cmd[1] == "fetch" and cmd[-1] == "pull/42/head:pr-42":
+                    # Fail first fetch; the branch name fetch succeeds
+                    return _GIT_FAIL
+                return _GIT_OK
+
+            mock_run.side_effect = mock_git_run
+
+            mock_response = Mock()
+            mock_response.success = True
+            mock_response.output = "Review completed"
+            mock_response.session_id = "session123"
+            mock_execute.return_value = mock_response
+
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                model="sonnet",
+                working_dir="/tmp",
+                pr_head_ref="feature-branch",
+                pr_head_sha=None,
+                pr_base_ref="main",
+            )
+
+            # Should still succeed despite PR fetch failure
+            assert result.success is True
+            git_calls = [call.args[0] for call in mock_run.call_args_list]
+            assert ["git", "fetch", "origin", "feature-branch"] in git_calls
+            # Without a head SHA the worktree tracks the fetched branch
+            assert git_calls[2][:4] == ["git", "worktree", "add", "--detach"]
+            assert git_calls[2][-1] == "origin/feature-branch"
+
+    async def test_review_runs_in_place_when_worktree_fails(self):
+        """Test the review falls back to the working directory."""
+        from core.adw_integration import trigger_review_workflow
+
+        with _patch_review_run() as (mock_execute, mock_run):
+            def mock_git_run(cmd, **kwargs):
+                return _GIT_FAIL if cmd[1] == "worktree" else _GIT_OK
+
+            mock_run.side_effect = mock_git_run
+            mock_execute.return_value = Mock(success=True, output="Review completed", session_id=None)
+
+            result = await trigger_review_workflow(
+                pr_number=42,
+                repo_full_name="owner/repo",
+                adw_id="test123",
+                working_dir="/tmp",
+                pr_head_sha="abc123",
+            )
+
+            assert result.success is True
+            assert mock_execute.call_args.args[0].working_dir == "/tmp"
+            # Nothing to remove
+            assert mock_run.call_count == 2
@@ -1,7 +1,13 @@
 """Tests for review action handlers."""
 
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import httpx
 import pytest
+from cachetools import LRUCache
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
+from apps.adw_server.core import review_actions
 from apps.adw_server.core.review_actions import (
     parse_review_status,
     extract_review_issues,
@@ -11,11 +17,20 @@ from apps.adw_server.core.review_actions import (
     check_reimplement_attempts,
     increment_reimplement_attempts,
     reset_reimplement_attempts,
-    _reimplement_attempts,
 )
 from apps.adw_server.core.adw_integration import WorkflowResult
 
 
+@pytest.fixture(autouse=True)
+def fresh_attempt_tracker(monkeypatch):
+    """Give each test an empty re-implementation attempt tracker."""
+    monkeypatch.setattr(
+        review_actions,
+        "_reimplement_attempts",
+        LRUCache(maxsize=review_actions.REIMPLEMENT_ATTEMPTS_MAXSIZE),
+    )
+
+
 # Sample review outputs for testing
 APPROVED_REVIEW = """
 # Code Review
@@ -149,6 +164,46 @@ class TestParseReviewStatus:
         status, _, _ = parse_review_status(output_no_brackets)
         assert status == "APPROVED"
 
+    @pytest.mark.parametrize("status_line,expected", [
+        ("approved", "APPROVED"),
+        ("Changes  Requested", "CHANGES_REQUESTED"),
+        ("[needs discussion]", "NEEDS_DISCUSSION"),
+        ("**CHANGES_REQUESTED**", "CHANGES_REQUESTED"),
+        ("APPROVED - minor nits only", "APPROVED"),
+    ])
+    def test_parse_status_case_and_spacing(self, status_line, expected):
+        """Test the status heading is matched case-insensitively."""
+        status, _, _ = parse_review_status(f"## Approval Status\n{status_line}")
+        assert status == expected
+
+    @pytest.mark.parametrize("status_line", ["CHANGES_REQUESTED", "**CHANGES_REQUESTED**"])
+    def test_parse_underscored_status_ignores_keywords_elsewhere(self, status_line):
+        """Test an underscored status line wins over "APPROVED" in the summary.
+
+        The regex parser this replaced didn't match these forms and fell back
+        to scanning the whole output, where any "APPROVED" made it APPROVED.
+        """
+        output = (
+            f"## Approval Status\n{status_line}\n\n"
+            "## Summary\nCannot be APPROVED until the tests pass.\n"
+        )
+        status, _, _ = parse_review_status(output)
+        assert status == "CHANGES_REQUESTED"
+
+    def test_parse_empty_sections(self):
+        """Test an empty section does not absorb the heading after it."""
+        output = (
+            "## Summary\n\n"
+            "## Recommendations\n"
+            "### Follow-ups\n"
+            "10. Split the handler module\n\n"
+            "## Approval Status\n\n"
+            "[ Approved ]\n"
+        )
+        status, summary, recs = parse_review_status(output)
+        assert status == "APPROVED"
+        assert summary == ""
+        assert recs == []
 
 class TestExtractReviewIssues:
     """Tests for extract_review_issues function."""
@@ -184,14 +239,35 @@ class TestExtractReviewIssues:
         assert len(issues["Moderate"]) == 0
         assert len(issues["Minor"]) == 0
 
+    def test_repeated_output_parsed_once(self):
+        """Test status and issues for the same output share one cached parse."""
+        review_actions._parse_review_cached.cache_clear()
+
+        issues = extract_review_issues(CHANGES_REQUESTED_REVIEW)
+        issues["Critical"].append("mutated by caller")
+        _, _, recommendations = parse_review_status(CHANGES_REQUESTED_REVIEW)
+        recommendations.clear()
+
+        cache_info = review_actions._parse_review_cached.cache_info()
+        assert (cache_info.hits, cache_info.misses) == (1, 1)
+        assert len(extract_review_issues(CHANGES_REQUESTED_REVIEW)["Critical"]) == 2
+        assert parse_review_status(CHANGES_REQUESTED_REVIEW)[2]
+
 
 class TestMergePullRequest:
     """Tests for merge_pull_request function."""
 
-    @patch('subprocess.run')
-    def test_successful_merge(self, mock_run):
+    @pytest.fixture(autouse=True)
+    def github_token(self, monkeypatch):
+        """Provide a token so merges go through the REST API."""
+        for name in ("GH_TOKEN", "GITHUB_TOKEN"):
+            monkeypatch.delenv(name, raising=False)
+        monkeypatch.setenv("GITHUB_PAT", "test-token")
+
+    @patch('httpx.Client.put')
+    def test_successful_merge(self, mock_put):
         """Test successful PR merge."""
-        mock_run.return_value = Mock(returncode=0, stderr="")
+        mock_put.return_value = httpx.Response(200, json={"merged": True})
 
         result = merge_pull_request(
             pr_number=42,
@@ -201,18 +277,15 @@ class TestMergePullRequest:
         )
 
         assert result is True
-        mock_run.assert_called_once()
-        args = mock_run.call_args[0][0]
-        assert "gh" in args
-        assert "pr" in args
-        assert "merge" in args
-        assert "42" in args
-        assert "--squash" in args
+        mock_put.assert_called_once()
+        assert mock_put.call_args.args[0] == "/repos/test-owner/test-repo/pulls/42/merge"
+        assert mock_put.call_args.kwargs["json"] == {"merge_method": "squash"}
+        assert mock_put.call_args.kwargs["headers"]["Authorization"] == "Bearer test-token"
 
-    @patch('subprocess.run')
-    def test_failed_merge(self, mock_run):
+    @patch('httpx.Client.put')
+    def test_failed_merge(self, mock_put):
         """Test failed PR merge."""
-        mock_run.return_value = Mock(returncode=1, stderr="Merge conflict")
+        mock_put.return_value = httpx.Response(409, json={"message": "Merge conflict"})
 
         result = merge_pull_request(
             pr_number=42,
@@ -222,11 +295,10 @@ class TestMergePullRequest:
 
         assert result is False
 
-    @patch('subprocess.run')
-    def test_merge_timeout(self, mock_run):
+    @patch('httpx.Client.put')
+    def test_merge_timeout(self, mock_put):
         """Test merge timeout handling."""
-        import subprocess
-        mock_run.side_effect = subprocess.TimeoutExpired("gh", 30)
+        mock_put.side_effect = httpx.ReadTimeout("timed out")
 
         result = merge_pull_request(
             pr_number=42,
@@ -236,22 +308,50 @@ class TestMergePullRequest:
 
         assert result is False
 
-    @patch('subprocess.run')
-    def test_merge_with_different_methods(self, mock_run):
+    @patch('httpx.Client.put')
+    def test_merge_with_different_methods(self, mock_put):
         """Test merge with different merge methods."""
+        mock_put.return_value = httpx.Response(200, json={"merged": True})
+
+        for method in ("squash", "merge", "rebase"):
+            merge_pull_request(42, "owner", "repo", merge_method=method)
+            assert mock_put.call_args.kwargs["json"] == {"merge_method": method}
+
+    @patch('subprocess.run')
+    @patch('httpx.Client.put')
+    def test_not_mergeable_falls_back_to_auto_merge(self, mock_put, mock_run):
+        """Test a 405 (e.g. checks pending) enables auto-merge through gh."""
+        mock_put.return_value = httpx.Response(405, json={"message": "Pull Request is not mergeable"})
         mock_run.return_value = Mock(returncode=0, stderr="")
 
-        # Test squash
-        merge_pull_request(42, "owner", "repo", merge_method="squash")
+        result = merge_pull_request(42, "owner", "repo", merge_method="rebase")
+
+        assert result is True
+        assert mock_run.call_args[0][0] == [
+            "gh", "pr", "merge", "42", "--repo", "owner/repo", "--rebase", "--auto",
+        ]
+
+    @patch('subprocess.run')
+    @patch('httpx.Client.put')
+    def test_without_token_uses_gh(self, mock_put, mock_run, monkeypatch):
+        """Test merging falls back to the gh CLI when no token is set."""
+        monkeypatch.delenv("GITHUB_PAT")
+        mock_run.return_value = Mock(returncode=0, stderr="")
+
+        result = merge_pull_request(42, "owner", "repo")
+
+        assert result is True
+        mock_put.assert_not_called()
         assert "--squash" in mock_run.call_args[0][0]
 
-        # Test merge
-        merge_pull_request(42, "owner", "repo", merge_method="merge")
-        assert "--merge" in mock_run.call_args[0][0]
+    @patch('subprocess.run')
+    def test_gh_timeout(self, mock_run, monkeypatch):
+        """Test a timed out gh merge is reported as a failure."""
+        import subprocess
+        monkeypatch.delenv("GITHUB_PAT")
+        mock_run.side_effect = subprocess.TimeoutExpired("gh", 30)
 
-        # Test rebase
-        merge_pull_request(42, "owner", "repo", merge_method="rebase")
-        assert "--rebase" in mock_run.call_args[0][0]
+        assert merge_pull_request(42, "owner", "repo") is False
 
 
 class TestTriggerReimplementation:
@@ -261,24 +361,10 @@ class TestTriggerReimplementation:
     @patch('apps.adw_server.core.review_actions.trigger_chore_implement_workflow')
     async def test_successful_reimplementation(self, mock_trigger):
         """Test successful re-implementation trigger."""
-        mock_chore_result = WorkflowResult(
-            success=True,
-            output="Chore completed",
-            session_id="chore-session",
-            adw_id="test-adw",
-            output_dir="/path/to/output",
-            plan_path="/path/to/plan.md",
-            error_message=None
-        )
-        mock_impl_result = WorkflowResult(
-            success=True,
-            output="Implementation completed",
-            session_id="impl-session",
-            adw_id="test-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
+        mock_chore_result = WorkflowResult.ok(
+            "Chore completed", "chore-session", "test-adw", plan_path="/path/to/plan.md"
         )
+        mock_impl_result = WorkflowResult.ok("Implementation completed", "impl-session", "test-adw")
         mock_trigger.return_value = (mock_chore_result, mock_impl_result)
 
         chore_result, impl_result = await trigger_reimplementation(
@@ -307,10 +393,6 @@ class TestTriggerReimplementation:
 class TestReimplementAttemptTracking:
     """Tests for re-implementation attempt tracking."""
 
-    def setup_method(self):
-        """Reset attempt counter before each test."""
-        _reimplement_attempts.clear()
-
     def test_check_attempts_initially_allowed(self):
         """Test that re-implementation is allowed initially."""
         allowed, count = check_reimplement_attempts(42, max_attempts=3)
@@ -358,191 +440,128 @@ class TestReimplementAttemptTracking:
         assert count_42 == 2
         assert count_99 == 1
 
+    def test_least_recently_used_issue_forgotten(self, monkeypatch):
+        """Test the tracker drops the stalest issue once it is full."""
+        monkeypatch.setattr(review_actions, "_reimplement_attempts", LRUCache(maxsize=2))
+        increment_reimplement_attempts(1)
+        increment_reimplement_attempts(2)
+        increment_reimplement_attempts(1)
+        increment_reimplement_attempts(3)
+
+        assert check_reimplement_attempts(1)[1] == 2
+        assert check_reimplement_attempts(2)[1] == 0
+        assert check_reimplement_attempts(3)[1] == 1
+
+
+    def test_concurrent_increments_are_all_counted(self):
+        """Test increments from several threads are not lost."""
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(increment_reimplement_attempts, [42] * 400))
+
+        assert check_reimplement_attempts(42)[1] == 400
+
+@pytest.fixture
+def review_action_io(monkeypatch):
+    """Replace the config, GitHub and workflow calls of handle_review_results.
+
+    Every automatic action is enabled and every call succeeds; tests change
+    only the attributes they care about on the returned namespace.
+    """
+    io = SimpleNamespace(
+        config=Mock(
+            auto_merge_on_approval=True,
+            auto_reimplement_on_changes=True,
+            merge_method="squash",
+            max_reimplement_attempts=3,
+        ),
+        merge=Mock(return_value=True),
+        trigger_reimplementation=AsyncMock(),
+        post_comment=AsyncMock(return_value=[True]),
+    )
+    monkeypatch.setattr(review_actions, "get_config", Mock(return_value=io.config))
+    monkeypatch.setattr(review_actions, "merge_pull_request", io.merge)
+    monkeypatch.setattr(review_actions, "trigger_reimplementation", io.trigger_reimplementation)
+    monkeypatch.setattr("apps.adw_server.core.handlers.post_comment_to_issues", io.post_comment)
+    return io
+
+
+def _review_result(output: str) -> WorkflowResult:
+    """Build a successful review WorkflowResult with the given output."""
+    return WorkflowResult.ok(output, "review-session", "review-adw")
+
+
+async def _handle(output: str, issue_numbers=(1,), repo_full_name: str = "owner/repo") -> dict:
+    """Run handle_review_results for PR #42 with fixed workflow arguments."""
+    return await handle_review_results(
+        review_result=_review_result(output),
+        pr_number=42,
+        issue_numbers=list(issue_numbers),
+        repo_full_name=repo_full_name,
+        original_prompt="Add feature",
+        issue_title="Add feature",
+        model="sonnet",
+        working_dir="/path/to/repo"
+    )
+
 
 class TestHandleReviewResults:
     """Tests for handle_review_results function."""
 
-    def setup_method(self):
-        """Reset attempt counter before each test."""
-        _reimplement_attempts.clear()
-
-    @pytest.mark.asyncio
-    @patch('apps.adw_server.core.review_actions.merge_pull_request')
-    @patch('apps.adw_server.core.review_actions.post_merge_comment')
-    @patch('apps.adw_server.core.review_actions.get_config')
-    async def test_approved_triggers_merge(self, mock_config, mock_post_comment, mock_merge):
+    async def test_approved_triggers_merge(self, review_action_io):
         """Test that APPROVED status triggers merge."""
-        # Mock config
-        config = Mock()
-        config.auto_merge_on_approval = True
-        config.auto_reimplement_on_changes = True
-        config.merge_method = "squash"
-        config.max_reimplement_attempts = 3
-        mock_config.return_value = config
-
-        mock_merge.return_value = True
-        mock_post_comment.return_value = True
-
-        review_result = WorkflowResult(
-            success=True,
-            output=APPROVED_REVIEW,
-            session_id="review-session",
-            adw_id="review-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
-        )
-
-        result = await handle_review_results(
-            review_result=review_result,
-            pr_number=42,
-            issue_numbers=[1],
-            repo_full_name="owner/repo",
-            original_prompt="Add feature",
-            issue_title="Add feature",
-            model="sonnet",
-            working_dir="/path/to/repo"
-        )
+        result = await _handle(APPROVED_REVIEW)
 
         assert result["action"] == "approved"
         assert result["approval_status"] == "APPROVED"
         assert result["merge_attempted"] is True
         assert result["success"] is True
-        mock_merge.assert_called_once()
+        review_action_io.merge.assert_called_once()
 
-    @pytest.mark.asyncio
-    @patch('apps.adw_server.core.review_actions.trigger_reimplementation')
-    @patch('apps.adw_server.core.review_actions.post_reimplementation_comment')
-    @patch('apps.adw_server.core.review_actions.get_config')
-    async def test_changes_requested_triggers_reimplement(
-        self, mock_config, mock_post_comment, mock_reimplement
-    ):
+    async def test_merge_comment_batched_across_issues(self, review_action_io):
+        """Test the merge comment for every linked issue is sent in one call."""
+        result = await _handle(APPROVED_REVIEW, issue_numbers=[1, 2])
+
+        assert result["success"] is True
+        review_action_io.post_comment.assert_awaited_once()
+        issue_numbers, comment, repo_owner, repo_name = review_action_io.post_comment.call_args.args
+        assert issue_numbers == [1, 2]
+        assert "PR Merged Successfully" in comment
+        assert (repo_owner, repo_name) == ("owner", "repo")
+
+    async def test_changes_requested_triggers_reimplement(self, review_action_io):
         """Test that CHANGES_REQUESTED triggers re-implementation."""
-        # Mock config
-        config = Mock()
-        config.auto_merge_on_approval = True
-        config.auto_reimplement_on_changes = True
-        config.merge_method = "squash"
-        config.max_reimplement_attempts = 3
-        mock_config.return_value = config
-
-        mock_chore_result = WorkflowResult(
-            success=True,
-            output="Chore completed",
-            session_id="chore-session",
-            adw_id="new-adw",
-            output_dir="/path/to/output",
-            plan_path="/path/to/plan.md",
-            error_message=None
-        )
-        mock_reimplement.return_value = (mock_chore_result, None)
-        mock_post_comment.return_value = True
-
-        review_result = WorkflowResult(
-            success=True,
-            output=CHANGES_REQUESTED_REVIEW,
-            session_id="review-session",
-            adw_id="review-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
+        mock_chore_result = WorkflowResult.ok(
+            "Chore completed", "chore-session", "new-adw", plan_path="/path/to/plan.md"
         )
+        review_action_io.trigger_reimplementation.return_value = (mock_chore_result, None)
 
-        result = await handle_review_results(
-            review_result=review_result,
-            pr_number=42,
-            issue_numbers=[1],
-            repo_full_name="owner/repo",
-            original_prompt="Add feature",
-            issue_title="Add feature",
-            model="sonnet",
-            working_dir="/path/to/repo"
-        )
+        result = await _handle(CHANGES_REQUESTED_REVIEW)
 
         assert result["action"] == "changes_requested"
         assert result["approval_status"] == "CHANGES_REQUESTED"
         assert result["reimplementation_attempted"] is True
         assert result["attempt_count"] == 1
-        mock_reimplement.assert_called_once()
+        review_action_io.trigger_reimplementation.assert_called_once()
+        assert "Re-Implementation Started" in review_action_io.post_comment.call_args.args[1]
 
-    @pytest.mark.asyncio
-    @patch('apps.adw_server.core.handlers.make_github_issue_comment')
-    @patch('apps.adw_server.core.review_actions.get_config')
-    async def test_max_attempts_blocks_reimplement(self, mock_config, mock_comment):
+    async def test_max_attempts_blocks_reimplement(self, review_action_io):
         """Test that max attempts blocks re-implementation."""
-        # Mock config
-        config = Mock()
-        config.auto_merge_on_approval = True
-        config.auto_reimplement_on_changes = True
-        config.merge_method = "squash"
-        config.max_reimplement_attempts = 3
-        mock_config.return_value = config
-
-        mock_comment.return_value = None
-
         # Simulate 3 previous attempts
         increment_reimplement_attempts(1)
         increment_reimplement_attempts(1)
         increment_reimplement_attempts(1)
 
-        review_result = WorkflowResult(
-            success=True,
-            output=CHANGES_REQUESTED_REVIEW,
-            session_id="review-session",
-            adw_id="review-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
-        )
-
-        result = await handle_review_results(
-            review_result=review_result,
-            pr_number=42,
-            issue_numbers=[1],
-            repo_full_name="owner/repo",
-            original_prompt="Add feature",
-            issue_title="Add feature",
-            model="sonnet",
-            working_dir="/path/to/repo"
-        )
+        result = await _handle(CHANGES_REQUESTED_REVIEW)
 
         assert result["action"] == "max_attempts_reached"
         assert result["success"] is False
         assert result["attempt_count"] == 3
-        mock_comment.assert_called()
+        assert "Maximum Re-Implementation Attempts" in review_action_io.post_comment.call_args.args[1]
+        review_action_io.trigger_reimplementation.assert_not_called()
 
-    @pytest.mark.asyncio
-    @patch('apps.adw_server.core.review_actions.get_config')
-    async def test_needs_discussion_posts_comment_only(self, mock_config):
+    async def test_needs_discussion_posts_comment_only(self, review_action_io):
         """Test that NEEDS_DISCUSSION only posts comment."""
-        # Mock config
-        config = Mock()
-        config.auto_merge_on_approval = True
-        config.auto_reimplement_on_changes = True
-        config.merge_method = "squash"
-        config.max_reimplement_attempts = 3
-        mock_config.return_value = config
-
-        review_result = WorkflowResult(
-            success=True,
-            output=NEEDS_DISCUSSION_REVIEW,
-            session_id="review-session",
-            adw_id="review-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
-        )
-
-        result = await handle_review_results(
-            review_result=review_result,
-            pr_number=42,
-            issue_numbers=[1],
-            repo_full_name="owner/repo",
-            original_prompt="Add feature",
-            issue_title="Add feature",
-            model="sonnet",
-            working_dir="/path/to/repo"
-        )
+        result = await _handle(NEEDS_DISCUSSION_REVIEW)
 
         assert result["action"] == "comment_only"
         assert result["approval_status"] == "NEEDS_DISCUSSION"
@@ -550,38 +569,9 @@ class TestHandleReviewResults:
         assert "merge_attempted" not in result
         assert "reimplementation_attempted" not in result
 
-    @pytest.mark.asyncio
-    @patch('apps.adw_server.core.review_actions.get_config')
-    async def test_invalid_repo_name_returns_error(self, mock_config):
+    async def test_invalid_repo_name_returns_error(self, review_action_io):
         """Test handling of invalid repository name format."""
-        # Mock config
-        config = Mock()
-        config.auto_merge_on_approval = True
-        config.auto_reimplement_on_changes = True
-        config.merge_method = "squash"
-        config.max_reimplement_attempts = 3
-        mock_config.return_value = config
-
-        review_result = WorkflowResult(
-            success=True,
-            output=APPROVED_REVIEW,
-            session_id="review-session",
-            adw_id="review-adw",
-            output_dir="/path/to/output",
-            plan_path=None,
-            error_message=None
-        )
-
-        result = await handle_review_results(
-            review_result=review_result,
-            pr_number=42,
-            issue_numbers=[1],
-            repo_full_name="invalid-format",  # Missing slash
-            original_prompt="Add feature",
-            issue_title="Add feature",
-            model="sonnet",
-            working_dir="/path/to/repo"
-        )
+        result = await _handle(APPROVED_REVIEW, repo_full_name="invalid-format")  # Missing slash
 
         assert result["action"] == "error"
         assert result["success"] is False
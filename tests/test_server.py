@@ -9,11 +9,22 @@ Tests cover:
 """
 
 import pytest
-import json
+import orjson
 from unittest.mock import Mock, patch, AsyncMock
 
-from httpx import AsyncClient
-from conftest import generate_github_signature
+from httpx import AsyncClient, Headers
+from conftest import generate_github_signature, response_json
+
+# Headers shared by every signed webhook delivery, normalized once
+WEBHOOK_HEADERS = Headers({"X-GitHub-Event": "issues", "Content-Type": "application/json"})
+
+
+def webhook_headers(signature: str, event_type: str = "issues") -> Headers:
+    """Build webhook request headers from the shared set plus a signature."""
+    headers = WEBHOOK_HEADERS.copy()
+    headers["X-GitHub-Event"] = event_type
+    headers["X-Hub-Signature-256"] = signature
+    return headers
 
 
 # ============================================================================
@@ -85,10 +96,11 @@ async def test_webhook_valid_signature(
     mock_config
 ):
     """Test webhook with valid signature is accepted."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    from apps.adw_server import server
+    payload = orjson.dumps(mock_github_issue_payload)
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
-    with patch("apps.adw_server.core.handlers.handle_issue_event") as mock_handler:
+    with patch.object(server, "handle_issue_event", new_callable=AsyncMock) as mock_handler:
         mock_handler.return_value = {
             "status": "success",
             "workflow_triggered": True,
@@ -98,11 +110,7 @@ async def test_webhook_valid_signature(
         response = await async_client.post(
             "/",
             content=payload,
-            headers={
-                "X-GitHub-Event": "issues",
-                "X-Hub-Signature-256": signature,
-                "Content-Type": "application/json"
-            }
+            headers=webhook_headers(signature)
         )
 
         assert response.status_code == 200
@@ -115,21 +123,17 @@ async def test_webhook_invalid_signature(
     mock_github_issue_payload
 ):
     """Test webhook with invalid signature is rejected."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    payload = orjson.dumps(mock_github_issue_payload)
     invalid_signature = "sha256=invalid_signature_here"
 
     response = await async_client.post(
         "/",
         content=payload,
-        headers={
-            "X-GitHub-Event": "issues",
-            "X-Hub-Signature-256": invalid_signature,
-            "Content-Type": "application/json"
-        }
+        headers=webhook_headers(invalid_signature)
     )
 
     assert response.status_code == 401
-    data = response.json()
+    data = response_json(response)
     assert "Invalid webhook signature" in data["detail"]
 
 
@@ -139,7 +143,7 @@ async def test_webhook_missing_signature(
     mock_github_issue_payload
 ):
     """Test webhook with missing signature is rejected."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    payload = orjson.dumps(mock_github_issue_payload)
 
     response = await async_client.post(
         "/",
@@ -151,7 +155,7 @@ async def test_webhook_missing_signature(
     )
 
     assert response.status_code == 401
-    data = response.json()
+    data = response_json(response)
     assert "Invalid webhook signature" in data["detail"]
 
 
@@ -162,7 +166,7 @@ async def test_webhook_missing_event_header(
     mock_config
 ):
     """Test webhook with missing X-GitHub-Event header is rejected."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    payload = orjson.dumps(mock_github_issue_payload)
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
     response = await async_client.post(
@@ -175,7 +179,7 @@ async def test_webhook_missing_event_header(
     )
 
     assert response.status_code == 400
-    data = response.json()
+    data = response_json(response)
     assert "Missing X-GitHub-Event header" in data["detail"]
 
 
@@ -190,10 +194,11 @@ async def test_webhook_issue_event(
     mock_config
 ):
     """Test webhook routes issue events to handle_issue_event."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    from apps.adw_server import server
+    payload = orjson.dumps(mock_github_issue_payload)
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
-    with patch("apps.adw_server.core.handlers.handle_issue_event") as mock_handler:
+    with patch.object(server, "handle_issue_event", new_callable=AsyncMock) as mock_handler:
         mock_handler.return_value = {
             "status": "success",
             "workflow_triggered": True,
@@ -204,15 +209,11 @@ async def test_webhook_issue_event(
         response = await async_client.post(
             "/",
             content=payload,
-            headers={
-                "X-GitHub-Event": "issues",
-                "X-Hub-Signature-256": signature,
-                "Content-Type": "application/json"
-            }
+            headers=webhook_headers(signature)
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert data["status"] == "success"
         assert data["workflow_triggered"] is True
         assert data["adw_id"] == "test-id-12345678"
@@ -235,10 +236,11 @@ async def test_webhook_pull_request_event(
     mock_config
 ):
     """Test webhook routes pull request events to handle_pull_request_event."""
-    payload = json.dumps(mock_github_pr_payload).encode("utf-8")
+    from apps.adw_server import server
+    payload = orjson.dumps(mock_github_pr_payload)
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
-    with patch("apps.adw_server.core.handlers.handle_pull_request_event") as mock_handler:
+    with patch.object(server, "handle_pull_request_event", new_callable=AsyncMock) as mock_handler:
         mock_handler.return_value = {
             "status": "success",
             "workflow_triggered": False,
@@ -249,15 +251,11 @@ async def test_webhook_pull_request_event(
         response = await async_client.post(
             "/",
             content=payload,
-            headers={
-                "X-GitHub-Event": "pull_request",
-                "X-Hub-Signature-256": signature,
-                "Content-Type": "application/json"
-            }
+            headers=webhook_headers(signature, "pull_request")
         )
 
         assert response.status_code == 200
-        data = response.json()
+        data = response_json(response)
         assert data["status"] == "success"
         assert data["pr_number"] == 456
 
@@ -267,6 +265,31 @@ async def test_webhook_pull_request_event(
         assert call_args.kwargs["payload"].pull_request.number == 456
 
 
+@pytest.mark.asyncio
+async def test_webhook_pull_request_non_trigger_action_skipped(
+    async_client: AsyncClient,
+    mock_github_pr_payload,
+    mock_config
+):
+    """Test PR actions that never start a review are answered without the handler."""
+    from apps.adw_server import server
+    payload = orjson.dumps({**mock_github_pr_payload, "action": "closed"})
+    signature = generate_github_signature(payload, mock_config.gh_wb_secret)
+
+    with patch.object(server, "handle_pull_request_event", new_callable=AsyncMock) as mock_handler:
+        response = await async_client.post(
+            "/",
+            content=payload,
+            headers=webhook_headers(signature, "pull_request")
+        )
+
+        assert response.status_code == 200
+        data = response_json(response)
+        assert data["workflow_triggered"] is False
+        assert data["action"] == "closed"
+        mock_handler.assert_not_called()
+
+
 # ============================================================================
 # Unsupported Event Tests
 # ============================================================================
@@ -277,26 +300,41 @@ async def test_webhook_unsupported_event(
     mock_config
 ):
     """Test webhook ignores unsupported event types."""
-    payload = json.dumps({"action": "created", "comment": {"body": "test"}}).encode("utf-8")
+    payload = orjson.dumps({"action": "created", "comment": {"body": "test"}})
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
     response = await async_client.post(
         "/",
         content=payload,
-        headers={
-            "X-GitHub-Event": "issue_comment",
-            "X-Hub-Signature-256": signature,
-            "Content-Type": "application/json"
-        }
+        headers=webhook_headers(signature, "issue_comment")
     )
 
     assert response.status_code == 200
-    data = response.json()
+    data = response_json(response)
     assert data["status"] == "ignored"
     assert "not supported" in data["reason"]
     assert data["event_type"] == "issue_comment"
 
 
+@pytest.mark.asyncio
+async def test_webhook_unsupported_event_skips_payload_parsing(
+    async_client: AsyncClient,
+    mock_config
+):
+    """Test unsupported events are ignored without parsing the body."""
+    payload = b"not a JSON document"
+    signature = generate_github_signature(payload, mock_config.gh_wb_secret)
+
+    response = await async_client.post(
+        "/",
+        content=payload,
+        headers=webhook_headers(signature, "push")
+    )
+
+    assert response.status_code == 200
+    assert response_json(response)["status"] == "ignored"
+
+
 # ============================================================================
 # Alternative Endpoint Tests
 # ============================================================================
@@ -308,10 +346,11 @@ async def test_webhook_alternative_endpoint(
     mock_config
 ):
     """Test alternative webhook endpoint /webhooks/github works the same."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    from apps.adw_server import server
+    payload = orjson.dumps(mock_github_issue_payload)
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
-    with patch("apps.adw_server.core.handlers.handle_issue_event") as mock_handler:
+    with patch.object(server, "handle_issue_event", new_callable=AsyncMock) as mock_handler:
         mock_handler.return_value = {
             "status": "success",
             "workflow_triggered": True
@@ -320,11 +359,7 @@ async def test_webhook_alternative_endpoint(
         response = await async_client.post(
             "/webhooks/github",
             content=payload,
-            headers={
-                "X-GitHub-Event": "issues",
-                "X-Hub-Signature-256": signature,
-                "Content-Type": "application/json"
-            }
+            headers=webhook_headers(signature)
         )
 
         assert response.status_code == 200
@@ -347,44 +382,120 @@ async def test_webhook_invalid_json(
     response = await async_client.post(
         "/",
         content=payload,
-        headers={
-            "X-GitHub-Event": "issues",
-            "X-Hub-Signature-256": signature,
-            "Content-Type": "application/json"
-        }
+        headers=webhook_headers(signature)
     )
 
     assert response.status_code == 400
-    data = response.json()
+    data = response_json(response)
     assert "Invalid JSON payload" in data["detail"]
 
 
 @pytest.mark.asyncio
-async def test_webhook_handler_error(
+async def test_webhook_invalid_json_unsigned_is_unauthorized(async_client: AsyncClient):
+    """Test a malformed body with a bad signature is refused before parsing."""
+    response = await async_client.post(
+        "/",
+        content=b"invalid json here",
+        headers=webhook_headers("sha256=" + "0" * 64)
+    )
+
+    assert response.status_code == 401
+
+@pytest.mark.asyncio
+async def test_webhook_issue_payload_missing_fields(
     async_client: AsyncClient,
-    mock_github_issue_payload,
     mock_config
 ):
-    """Test webhook handles errors from event handlers gracefully."""
-    payload = json.dumps(mock_github_issue_payload).encode("utf-8")
+    """Test well-formed JSON that isn't an issue payload gets a distinct error."""
+    payload = b'{"action": "opened"}'
     signature = generate_github_signature(payload, mock_config.gh_wb_secret)
 
-    with patch("apps.adw_server.core.handlers.handle_issue_event") as mock_handler:
-        mock_handler.side_effect = Exception("Handler error")
+    response = await async_client.post(
+        "/",
+        content=payload,
+        headers=webhook_headers(signature)
+    )
 
-        response = await async_client.post(
-            "/",
-            content=payload,
-            headers={
-                "X-GitHub-Event": "issues",
-                "X-Hub-Signature-256": signature,
-                "Content-Type": "application/json"
-            }
-        )
+    assert response.status_code == 400
+    data = response_json(response)
+    assert "Invalid issue payload" in data["detail"]
 
-        assert response.status_code == 500
-        data = response.json()
-        assert "Error processing webhook" in data["detail"]
+
+@pytest.mark.asyncio
+async def test_webhook_payload_too_large(
+    async_client: AsyncClient,
+    mock_config,
+    monkeypatch
+):
+    """Test webhook bodies over the size limit are rejected with 413."""
+    from apps.adw_server import server
+    monkeypatch.setattr(server.config, "webhook_max_body_bytes", 16)
+
+    payload = orjson.dumps({"action": "opened", "padding": "x" * 64})
+    signature = generate_github_signature(payload, mock_config.gh_wb_secret)
+
+    response = await async_client.post(
+        "/",
+        content=payload,
+        headers=webhook_headers(signature)
+    )
+
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_webhook_chunked_payload_too_large(
+    async_client: AsyncClient,
+    mock_config,
+    monkeypatch
+):
+    """Test a body sent without Content-Length is cut off once it passes the limit."""
+    from apps.adw_server import server
+    monkeypatch.setattr(server.config, "webhook_max_body_bytes", 16)
+
+    payload = orjson.dumps({"action": "opened", "padding": "x" * 64})
+    signature = generate_github_signature(payload, mock_config.gh_wb_secret)
+
+    async def chunks():
+        for start in range(0, len(payload), 8):
+            yield payload[start:start + 8]
+
+    response = await async_client.post(
+        "/",
+        content=chunks(),
+        headers=webhook_headers(signature)
+    )
+
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+
+
+@pytest.mark.asyncio
+async def test_webhook_handler_error(
+    async_client: AsyncClient,
+    signed_issue_payload,
+    mock_config,
+    monkeypatch
+):
+    """Test webhook handles errors from event handlers gracefully."""
+    from apps.adw_server import server
+    payload, signature = signed_issue_payload
+
+    async def failing_handler(**kwargs):
+        raise Exception("Handler error")
+
+    # Swap the name the route calls; patching core.handlers would not reach it
+    monkeypatch.setattr(server, "handle_issue_event", failing_handler)
+
+    response = await async_client.post(
+        "/",
+        content=payload,
+        headers=webhook_headers(signature)
+    )
+
+    assert response.status_code == 500
+    data = response_json(response)
+    assert "Error processing webhook" in data["detail"]
 
 
 # ============================================================================
@@ -404,3 +515,21 @@ async def test_cors_headers(async_client: AsyncClient, mock_config):
 
     # Check for CORS headers
     assert "access-control-allow-origin" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_cors_preflight_cached_by_browser(async_client: AsyncClient, mock_config):
+    """Test preflight responses let browsers cache them for two hours."""
+    if not mock_config.cors_enabled:
+        pytest.skip("CORS not enabled in test config")
+
+    response = await async_client.options(
+        "/health",
+        headers={
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "GET",
+        }
+    )
+
+    assert response.status_code == 200
+    assert response.headers["access-control-max-age"] == "7200"
@@ -0,0 +1,77 @@
+"""Tests for the background workflow queue.
+
+Tests cover:
+- Queued handler calls run on the worker
+- Handler failures don't stop the worker
+- Worker shutdown
+- Queueing without a running worker
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+from apps.adw_server.core.workflow_queue import (
+    enqueue_workflow,
+    start_workflow_worker,
+    stop_workflow_worker,
+    wait_for_queued_workflows,
+)
+
+
+# ============================================================================
+# Worker Tests
+# ============================================================================
+
+@pytest.mark.asyncio
+async def test_enqueued_workflow_runs_on_worker():
+    """Test a queued handler is awaited with its keyword arguments."""
+    handler = AsyncMock(return_value={"workflow_triggered": True, "adw_id": "abc12345"})
+    worker = start_workflow_worker()
+
+    try:
+        await enqueue_workflow(handler, description="issue #123", payload="payload", model="sonnet")
+        await asyncio.wait_for(wait_for_queued_workflows(), timeout=1)
+    finally:
+        await stop_workflow_worker(worker)
+
+    handler.assert_awaited_once_with(payload="payload", model="sonnet")
+
+
+@pytest.mark.asyncio
+async def test_worker_survives_handler_exception():
+    """Test a failing handler is logged and later items still run."""
+    failing = AsyncMock(side_effect=RuntimeError("workflow crashed"))
+    succeeding = AsyncMock(return_value={"workflow_triggered": False})
+    worker = start_workflow_worker()
+
+    try:
+        await enqueue_workflow(failing, description="issue #1")
+        await enqueue_workflow(succeeding, description="issue #2")
+        await asyncio.wait_for(wait_for_queued_workflows(), timeout=1)
+    finally:
+        await stop_workflow_worker(worker)
+
+    failing.assert_awaited_once()
+    succeeding.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stop_workflow_worker_cancels_task():
+    """Test stopping the worker cancels its task."""
+    worker = start_workflow_worker()
+
+    await stop_workflow_worker(worker)
+
+    assert worker.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_enqueue_without_worker_raises():
+    """Test queueing fails loudly when no worker is running."""
+    handler = AsyncMock()
+
+    with pytest.raises(RuntimeError, match="not running"):
+        await enqueue_workflow(handler, description="issue #123")
+
+    handler.assert_not_awaited()